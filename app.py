@@ -1,8 +1,21 @@
-from src.singleton.app import app
-from src.singleton.env import env
-from src.singleton.socketio import socketio
+import eventlet
+
+eventlet.monkey_patch()
+
+from src.config import start_scheduler  # noqa: E402
+from src.factory import build_app  # noqa: E402
+from src.singleton.env import env  # noqa: E402
+from src.singleton.scheduler import scheduler  # noqa: E402
+from src.singleton.socketio import socketio  # noqa: E402
+
+# Building the app starts nothing in the background, so CLI commands and gunicorn's
+# master stay cheap. The scheduler is started by the serving process only.
+app = build_app()
 
 if __name__ == "__main__":
+    if env.SCHEDULER_MODE == "embedded":
+        start_scheduler(scheduler)
+
     socketio.run(
         app,
         debug=(env.FLASK_ENV == "development"),
@@ -0,0 +1,4 @@
+#!/bin/sh
+
+# Let the replica stream the WAL from the primary
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -8,5 +8,11 @@ if [ $? -ne 0 ]; then
     exit 1
 fi
 
-echo "Starting Flask app..."
-exec python app.py
+if [ "$FLASK_ENV" = "development" ]; then
+    echo "Starting Flask app..."
+    exec python app.py
+fi
+
+# Worker settings live in gunicorn.conf.py
+echo "Starting gunicorn..."
+exec gunicorn --config gunicorn.conf.py app:app
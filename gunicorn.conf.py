@@ -0,0 +1,48 @@
+from src.singleton.env import env
+
+# The master process must stay unpatched, so only the environment is read here.
+# Everything else is imported by the workers once eventlet has patched them.
+worker_class = "eventlet"
+# Several workers share the port, so Socket.IO polling needs sticky sessions in front
+# or SOCKETIO_WEBSOCKET_ONLY (see create_app)
+workers = env.SERVER_WORKERS
+worker_connections = env.SERVER_WORKER_CONNECTIONS
+bind = "0.0.0.0:5000"
+timeout = env.SERVER_TIMEOUT_SECS
+graceful_timeout = env.SERVER_GRACEFUL_TIMEOUT_SECS
+keepalive = env.SERVER_KEEPALIVE_SECS
+
+# Recycle workers after a number of requests, jittered so they don't all restart at once.
+# Off by default: every Socket.IO long-polling request counts, so a busy worker would
+# restart every few minutes and drop all of its sockets. Only worth enabling to contain
+# a leak, with a limit high enough for the polling traffic.
+max_requests = env.SERVER_MAX_REQUESTS
+max_requests_jitter = env.SERVER_MAX_REQUESTS_JITTER
+
+
+def post_worker_init(worker):
+    import eventlet
+
+    from src.config import start_scheduler
+    from src.singleton.scheduler import scheduler
+
+    # Runs in the worker once the app is loaded
+    if env.SCHEDULER_MODE == "embedded":
+        start_scheduler(scheduler)
+
+    eventlet.spawn(drain_socket_connections, worker)
+
+
+def drain_socket_connections(worker):
+    import eventlet
+
+    from src.singleton.socketio import socketio
+
+    while worker.alive:
+        eventlet.sleep(1)
+
+    # The worker is stopping, on SIGTERM or after max_requests. Close the Socket.IO
+    # connections so clients reconnect to another worker instead of being cut off when
+    # the graceful timeout runs out.
+    print(f"Worker {worker.pid} is shutting down, closing socket connections...")
+    socketio.server.eio.disconnect()
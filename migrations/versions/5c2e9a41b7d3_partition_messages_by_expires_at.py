@@ -0,0 +1,91 @@
+"""partition messages by expires_at
+
+Revision ID: 5c2e9a41b7d3
+Revises: 7f7b88963950
+Create Date: 2026-10-18 12:31:07.482615
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.singleton.env import env
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e9a41b7d3'
+down_revision = '7f7b88963950'
+branch_labels = None
+depends_on = None
+
+MESSAGE_COLUMNS = 'id, chat_id, sender_user_id, sender_chat_id, content, timestamp, expires_at'
+
+
+def create_messages_table(primary_key, **kwargs):
+    op.create_table('messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('chat_id', sa.UUID(), nullable=False),
+    sa.Column('sender_user_id', sa.Uuid(), nullable=False),
+    sa.Column('sender_chat_id', sa.Uuid(), nullable=False),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], name='messages_chat_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['sender_chat_id', 'sender_user_id'], ['chat_participants.chat_id', 'chat_participants.user_id'], name='messages_sender_chat_id_sender_user_id_fkey', ondelete='CASCADE'),
+    primary_key,
+    **kwargs
+    )
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_chat_id_timestamp_id', ['chat_id', 'timestamp', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_messages_expires_at'), ['expires_at'], unique=False)
+
+
+def move_messages_aside():
+    op.rename_table('messages', 'messages_old')
+    op.execute('ALTER INDEX messages_pkey RENAME TO messages_old_pkey')
+    op.execute('ALTER INDEX IF EXISTS messages_id_key RENAME TO messages_old_id_key')
+
+    with op.batch_alter_table('messages_old', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_chat_id_timestamp_id')
+        batch_op.drop_index(batch_op.f('ix_messages_expires_at'))
+
+
+def upgrade():
+    move_messages_aside()
+
+    create_messages_table(
+        sa.PrimaryKeyConstraint('id', 'expires_at'),
+        postgresql_partition_by='RANGE (expires_at)',
+    )
+    op.execute('CREATE TABLE messages_default PARTITION OF messages DEFAULT')
+
+    # Hourly partitions up to the furthest expiration a message can have, so that new
+    # rows don't land in the default partition before the cleanup job creates more
+    now = datetime.now(timezone.utc)
+    latest_expiration = op.get_bind().execute(sa.text('SELECT max(expires_at) FROM messages_old')).scalar()
+    horizon = max(latest_expiration or now, now + timedelta(seconds=env.MESSAGE_TTL_SECS)) + timedelta(hours=3)
+    partition_start = now.replace(minute=0, second=0, microsecond=0)
+
+    while partition_start < horizon:
+        partition_end = partition_start + timedelta(hours=1)
+        op.execute(
+            f"CREATE TABLE messages_p{partition_start:%Y%m%d%H} PARTITION OF messages "
+            f"FOR VALUES FROM ('{partition_start.isoformat()}') TO ('{partition_end.isoformat()}')"
+        )
+        partition_start = partition_end
+
+    # Already expired messages are left behind
+    op.execute(f'INSERT INTO messages ({MESSAGE_COLUMNS}) SELECT {MESSAGE_COLUMNS} FROM messages_old WHERE expires_at > now()')
+    op.drop_table('messages_old')
+
+
+def downgrade():
+    move_messages_aside()
+
+    create_messages_table(sa.PrimaryKeyConstraint('id'))
+    op.execute(f'INSERT INTO messages ({MESSAGE_COLUMNS}) SELECT {MESSAGE_COLUMNS} FROM messages_old')
+
+    # Dropping the partitioned table drops all of its partitions
+    op.drop_table('messages_old')
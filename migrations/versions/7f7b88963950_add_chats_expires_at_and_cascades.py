@@ -0,0 +1,61 @@
+"""add chats expires_at and cascades
+
+Revision ID: 7f7b88963950
+Revises: e33a06cad620
+Create Date: 2026-10-18 11:58:44.316920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f7b88963950'
+down_revision = 'e33a06cad620'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+
+    # A chat lives until its newest message expires, plus the same slack the app uses.
+    # Chats without messages become due right away, as they were for the old job.
+    op.execute("""
+        UPDATE chats
+        SET expires_at = COALESCE(
+            (SELECT max(messages.expires_at) FROM messages WHERE messages.chat_id = chats.id),
+            now()
+        ) + interval '60 seconds'
+    """)
+
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.alter_column('expires_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+        batch_op.create_index(batch_op.f('ix_chats_expires_at'), ['expires_at'], unique=False)
+
+    with op.batch_alter_table('chat_participants', schema=None) as batch_op:
+        batch_op.drop_constraint('chat_participants_chat_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('chat_participants_chat_id_fkey', 'chats', ['chat_id'], ['id'], ondelete='CASCADE')
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_constraint('messages_chat_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('messages_sender_chat_id_sender_user_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('messages_chat_id_fkey', 'chats', ['chat_id'], ['id'], ondelete='CASCADE')
+        batch_op.create_foreign_key('messages_sender_chat_id_sender_user_id_fkey', 'chat_participants', ['sender_chat_id', 'sender_user_id'], ['chat_id', 'user_id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_constraint('messages_sender_chat_id_sender_user_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('messages_chat_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('messages_sender_chat_id_sender_user_id_fkey', 'chat_participants', ['sender_chat_id', 'sender_user_id'], ['chat_id', 'user_id'])
+        batch_op.create_foreign_key('messages_chat_id_fkey', 'chats', ['chat_id'], ['id'])
+
+    with op.batch_alter_table('chat_participants', schema=None) as batch_op:
+        batch_op.drop_constraint('chat_participants_chat_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('chat_participants_chat_id_fkey', 'chats', ['chat_id'], ['id'])
+
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chats_expires_at'))
+        batch_op.drop_column('expires_at')
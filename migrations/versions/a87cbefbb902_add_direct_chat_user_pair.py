@@ -0,0 +1,57 @@
+"""add direct chat user pair
+
+Revision ID: a87cbefbb902
+Revises: 865e04c5f6b4
+Create Date: 2026-10-18 10:03:17.540921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a87cbefbb902'
+down_revision = '865e04c5f6b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('direct_user_low_id', sa.Uuid(), nullable=True))
+        batch_op.add_column(sa.Column('direct_user_high_id', sa.Uuid(), nullable=True))
+        batch_op.create_foreign_key('chats_direct_user_low_id_fkey', 'users', ['direct_user_low_id'], ['id'])
+        batch_op.create_foreign_key('chats_direct_user_high_id_fkey', 'users', ['direct_user_high_id'], ['id'])
+
+    # Every existing two-participant chat is a direct chat. If a pair was duplicated by
+    # the old racy check, only its first chat gets the key.
+    op.execute("""
+        UPDATE chats
+        SET direct_user_low_id = pairs.low_id, direct_user_high_id = pairs.high_id
+        FROM (
+            SELECT DISTINCT ON (low_id, high_id) chat_id, low_id, high_id
+            FROM (
+                SELECT
+                    chat_id,
+                    min(user_id::text COLLATE "C")::uuid AS low_id,
+                    max(user_id::text COLLATE "C")::uuid AS high_id
+                FROM chat_participants
+                GROUP BY chat_id
+                HAVING count(*) = 2
+            ) AS grouped
+            ORDER BY low_id, high_id, chat_id
+        ) AS pairs
+        WHERE chats.id = pairs.chat_id
+    """)
+
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_chats_direct_user_pair', ['direct_user_low_id', 'direct_user_high_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('chats', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_chats_direct_user_pair', type_='unique')
+        batch_op.drop_constraint('chats_direct_user_high_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('chats_direct_user_low_id_fkey', type_='foreignkey')
+        batch_op.drop_column('direct_user_high_id')
+        batch_op.drop_column('direct_user_low_id')
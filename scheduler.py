@@ -0,0 +1,20 @@
+import eventlet
+
+eventlet.monkey_patch()
+
+from src.config import start_scheduler  # noqa: E402
+from src.factory import build_app  # noqa: E402
+from src.singleton.env import env  # noqa: E402
+from src.singleton.scheduler import scheduler  # noqa: E402
+
+# Runs the CRON jobs in their own process, for SCHEDULER_MODE=standalone
+if __name__ == "__main__":
+    if env.SCHEDULER_MODE != "standalone":
+        raise SystemExit("SCHEDULER_MODE must be standalone to run the scheduler.")
+
+    build_app()
+    start_scheduler(scheduler)
+    print("Scheduler started.")
+
+    while True:
+        eventlet.sleep(60)
@@ -1 +1,7 @@
-from . import auth_controller, chat_controller, ping_controller, user_controller
+from . import (
+    auth_controller,
+    chat_controller,
+    metrics_controller,
+    ping_controller,
+    user_controller,
+)
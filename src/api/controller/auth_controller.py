@@ -1,14 +1,17 @@
 from flask import request
 
 from src.api.blueprint.api_bp import api_bp
+from src.api.decorator.rate_limited import rate_limited
 from src.api.decorator.requires_auth import requires_auth
 from src.api.response_body.success_response_body import SuccessResponseBody
 from src.api.schema.auth.signin_schema import SigninSchema
 from src.api.schema.auth.signup_schema import SignupSchema
+from src.common.dto.rate_limit import RateLimit
 from src.service import auth_service
 
 
 @api_bp.post("/auth/signup")
+@rate_limited("signup", per_ip=RateLimit.per_minute(5))
 def signup():
     body = SignupSchema().load(request.json)  # type: ignore
     auth_service.signup(
@@ -20,6 +23,7 @@ def signup():
 
 
 @api_bp.post("/auth/signin")
+@rate_limited("signin", per_ip=RateLimit.per_minute(10))
 def signin():
     body = SigninSchema().load(request.json)  # type: ignore
     auth_service.signin(username=body["username"], password=body["password"])  # type: ignore
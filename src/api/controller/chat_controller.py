@@ -1,12 +1,18 @@
 from flask import request
 
 from src.api.blueprint.api_bp import api_bp
+from src.api.decorator.rate_limited import rate_limited
 from src.api.decorator.requires_auth import requires_auth
 from src.api.dto.chat.create_chat_response_dto import CreateChatResponseDto
+from src.api.dto.chat.get_chat_messages_response_dto import (
+    GetChatMessagesResponseDto,
+)
 from src.api.dto.chat.get_chat_response_dto import GetChatResponseDto
 from src.api.response_body.success_response_body import SuccessResponseBody
 from src.api.schema.chat.create_direct_chat_schema import CreateDirectChatSchema
 from src.api.schema.chat.get_chat_by_id_schema import GetChatByIdSchema
+from src.api.schema.chat.get_chat_messages_schema import GetChatMessagesSchema
+from src.common.dto.rate_limit import RateLimit
 from src.service import chat_service
 
 
@@ -14,7 +20,10 @@ from src.service import chat_service
 @requires_auth
 def get_all_chats():
     chats = chat_service.get_all_chats()
-    response_data = list(map(GetChatResponseDto.from_chat, chats))
+    recent_messages = chat_service.get_recent_messages([chat.id for chat in chats])
+    response_data = [
+        GetChatResponseDto.from_chat(chat, recent_messages[chat.id]) for chat in chats
+    ]
 
     return SuccessResponseBody(
         200,
@@ -28,7 +37,8 @@ def get_all_chats():
 def get_chat_by_id(chat_id: str):
     params = GetChatByIdSchema().load({"chat_id": chat_id})
     chat = chat_service.get_chat_by_id_or_raise(params["chat_id"])  # type: ignore
-    response_data = GetChatResponseDto.from_chat(chat)
+    recent_messages = chat_service.get_recent_messages([chat.id])
+    response_data = GetChatResponseDto.from_chat(chat, recent_messages[chat.id])
 
     return SuccessResponseBody(
         200,
@@ -37,8 +47,30 @@ def get_chat_by_id(chat_id: str):
     ).to_response()
 
 
+@api_bp.get("/chats/<chat_id>/messages")
+@requires_auth
+def get_chat_messages(chat_id: str):
+    params = GetChatMessagesSchema().load(
+        {**request.args.to_dict(), "chat_id": chat_id}
+    )
+    messages = chat_service.get_messages(
+        params["chat_id"],  # type: ignore
+        before=params["before"],  # type: ignore
+        after=params["after"],  # type: ignore
+        limit=params["limit"],  # type: ignore
+    )
+    response_data = GetChatMessagesResponseDto.from_messages(messages)
+
+    return SuccessResponseBody(
+        200,
+        "Messages retrieved successfully.",
+        response_data,
+    ).to_response()
+
+
 @api_bp.post("/chats/direct")
 @requires_auth
+@rate_limited("create_direct_chat", per_user=RateLimit.per_minute(30))
 def create_direct_chat():
     body = CreateDirectChatSchema().load(request.json)  # type: ignore
     chat_id = chat_service.create_direct_chat(body["contact_username"])  # type: ignore
@@ -0,0 +1,14 @@
+from src.api.blueprint.api_bp import api_bp
+from src.api.decorator.requires_metrics_token import requires_metrics_token
+from src.api.response_body.success_response_body import SuccessResponseBody
+from src.singleton.metrics import metrics
+
+
+@api_bp.get("/metrics")
+@requires_metrics_token
+def get_metrics():
+    return SuccessResponseBody(
+        200,
+        "Metrics retrieved successfully.",
+        metrics.snapshot(),
+    ).to_response()
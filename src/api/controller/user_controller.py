@@ -1,12 +1,14 @@
 from flask import request
 
 from src.api.blueprint.api_bp import api_bp
+from src.api.decorator.rate_limited import rate_limited
 from src.api.decorator.requires_auth import requires_auth
 from src.api.dto.user.get_current_user_response_dto import GetCurrentUserResponseDto
 from src.api.response_body.success_response_body import SuccessResponseBody
 from src.api.schema.user.update_name_schema import UpdateNameSchema
 from src.api.schema.user.update_password_schema import UpdatePasswordSchema
 from src.api.schema.user.update_username_schema import UpdateUsernameSchema
+from src.common.dto.rate_limit import RateLimit
 from src.service import user_service
 
 
@@ -47,6 +49,7 @@ def update_username():
 
 @api_bp.put("/users/me/password")
 @requires_auth
+@rate_limited("update_password", per_user=RateLimit.per_minute(5))
 def update_password():
     body = UpdatePasswordSchema().load(request.json)  # type: ignore
     user_service.update_password(
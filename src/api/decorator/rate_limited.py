@@ -0,0 +1,35 @@
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import request
+
+from src.common.dto.rate_limit import RateLimit
+from src.service import rate_limit_service, session_service
+
+
+def rate_limited(
+    event: str,
+    *,
+    per_user: Optional[RateLimit] = None,
+    per_ip: Optional[RateLimit] = None,
+) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            limits: dict[str, RateLimit] = {}
+
+            if per_ip:
+                limits[rate_limit_service.get_ip_key(event, request.remote_addr)] = (
+                    per_ip
+                )
+            if per_user:
+                # Must be applied below requires_auth
+                user_id = session_service.get_current_session_data().user_data.user_id
+                limits[rate_limit_service.get_user_key(event, user_id)] = per_user
+
+            rate_limit_service.take_token(limits)
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,25 @@
+import hmac
+from functools import wraps
+from typing import Callable
+
+from flask import abort, request
+
+from src.common.exception.http.unauthorized_exception import UnauthorizedException
+from src.singleton.env import env
+
+
+def requires_metrics_token(function: Callable) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        # Without a configured token the route doesn't exist
+        if not env.METRICS_TOKEN:
+            abort(404)
+
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+
+        if not hmac.compare_digest(token, env.METRICS_TOKEN):
+            raise UnauthorizedException()
+
+        return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.api.dto.chat.message_response_dto import MessageResponseDto
+from src.common.dto.message_cursor import MessageCursor
+from src.model.message import Message
+
+
+@dataclass
+class GetChatMessagesResponseDto:
+    messages: List[MessageResponseDto]
+    before: Optional[str]
+    after: Optional[str]
+
+    @staticmethod
+    def from_messages(messages: List[Message]) -> "GetChatMessagesResponseDto":
+        if not messages:
+            return GetChatMessagesResponseDto(messages=[], before=None, after=None)
+
+        oldest_message, newest_message = messages[0], messages[-1]
+
+        return GetChatMessagesResponseDto(
+            messages=list(map(MessageResponseDto.from_message, messages)),
+            before=MessageCursor(oldest_message.timestamp, oldest_message.id).encode(),
+            after=MessageCursor(newest_message.timestamp, newest_message.id).encode(),
+        )
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from src.api.dto.chat.message_response_dto import MessageResponseDto
+from src.common.dto.message_cursor import MessageCursor
 from src.model.chat import Chat
+from src.model.message import Message
 
 
 @dataclass
@@ -18,21 +21,15 @@ class _ChatParticipant:
     user: _User
 
 
-@dataclass
-class _Message:
-    id: UUID
-    sender_id: Tuple[UUID, UUID]
-    content: str
-
-
 @dataclass
 class GetChatResponseDto:
     id: UUID
     participants: List[_ChatParticipant]
-    messages: List[_Message]
+    messages: List[MessageResponseDto]
+    messages_before: Optional[str]
 
     @staticmethod
-    def from_chat(chat: Chat) -> "GetChatResponseDto":
+    def from_chat(chat: Chat, messages: List[Message]) -> "GetChatResponseDto":
         participants = [
             _ChatParticipant(
                 id=chat_participant.id,
@@ -45,17 +42,16 @@ class GetChatResponseDto:
             for chat_participant in chat.participants
         ]
 
-        messages = [
-            _Message(
-                id=message.id,
-                sender_id=message.sender_id,
-                content=message.content,
-            )
-            for message in chat.messages
-        ]
+        # Cursor for GET /chats/<id>/messages?before=... to page further back
+        messages_before = (
+            MessageCursor(messages[0].timestamp, messages[0].id).encode()
+            if messages
+            else None
+        )
 
         return GetChatResponseDto(
             id=chat.id,
             participants=participants,
-            messages=messages,
+            messages=list(map(MessageResponseDto.from_message, messages)),
+            messages_before=messages_before,
         )
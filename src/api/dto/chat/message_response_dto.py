@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Tuple
+from uuid import UUID
+
+from src.model.message import Message
+
+
+@dataclass
+class MessageResponseDto:
+    id: UUID
+    sender_id: Tuple[UUID, UUID]
+    content: str
+    timestamp: str
+
+    @staticmethod
+    def from_message(message: Message) -> "MessageResponseDto":
+        return MessageResponseDto(
+            id=message.id,
+            sender_id=message.sender_id,
+            content=message.content,
+            timestamp=message.timestamp.isoformat(),
+        )
@@ -2,6 +2,9 @@ from marshmallow import ValidationError
 
 from src.api.response_body.error_response_body import ErrorResponseBody
 from src.common.exception.http.http_exception import HttpException
+from src.common.exception.http.too_many_requests_exception import (
+    TooManyRequestsException,
+)
 from src.common.exception.http.unauthorized_exception import UnauthorizedException
 from src.singleton.env import env
 
@@ -18,6 +21,16 @@ def handle_unauthorized_exception(e: UnauthorizedException):
     return ErrorResponseBody(e.status_code, e.message).to_response(clear_session=True)
 
 
+def handle_too_many_requests_exception(e: TooManyRequestsException):
+    response = ErrorResponseBody(
+        e.status_code,
+        e.message,
+        {"retry_after": e.retry_after},
+    ).to_response()
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response
+
+
 def handle_exception(e: Exception):
     return (
         ErrorResponseBody(500, "Internal server error").to_response()
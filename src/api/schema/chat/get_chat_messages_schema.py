@@ -0,0 +1,26 @@
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
+
+from src.common.dto.message_cursor import MessageCursor
+
+
+class MessageCursorField(fields.Field):
+    def _deserialize(self, value, attr, data, **kwargs) -> MessageCursor:
+        try:
+            return MessageCursor.decode(value)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValidationError("Invalid cursor.") from e
+
+
+class GetChatMessagesSchema(Schema):
+    chat_id = fields.UUID(required=True)
+
+    before = MessageCursorField(load_default=None)
+
+    after = MessageCursorField(load_default=None)
+
+    limit = fields.Int(load_default=50, validate=validate.Range(min=1, max=100))
+
+    @validates_schema
+    def validate_single_cursor(self, data, **kwargs) -> None:
+        if data.get("before") and data.get("after"):
+            raise ValidationError("Only one of before or after may be provided.")
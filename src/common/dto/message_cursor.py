@@ -0,0 +1,24 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass
+class MessageCursor:
+    timestamp: datetime
+    message_id: UUID
+
+    def encode(self) -> str:
+        raw_cursor = f"{self.timestamp.isoformat()}|{self.message_id}"
+        return urlsafe_b64encode(raw_cursor.encode("utf-8")).decode("utf-8")
+
+    @staticmethod
+    def decode(encoded: str) -> "MessageCursor":
+        raw_cursor = urlsafe_b64decode(encoded.encode("utf-8")).decode("utf-8")
+        timestamp, message_id = raw_cursor.split("|", 1)
+
+        return MessageCursor(
+            timestamp=datetime.fromisoformat(timestamp),
+            message_id=UUID(message_id),
+        )
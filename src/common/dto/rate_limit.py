@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    refill_per_sec: float
+
+    @staticmethod
+    def per_minute(count: int, *, burst: Optional[int] = None) -> "RateLimit":
+        return RateLimit(capacity=burst or count, refill_per_sec=count / 60)
+
+    @staticmethod
+    def per_second(count: int, *, burst: Optional[int] = None) -> "RateLimit":
+        return RateLimit(capacity=burst or count, refill_per_sec=count)
@@ -0,0 +1,6 @@
+from src.common.exception.http.http_exception import HttpException
+
+
+class ServiceUnavailableException(HttpException):
+    def __init__(self):
+        super().__init__(503, "Service temporarily unavailable.")
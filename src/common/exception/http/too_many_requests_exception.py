@@ -0,0 +1,11 @@
+from src.common.exception.http.http_exception import HttpException
+
+
+class TooManyRequestsException(HttpException):
+    def __init__(self, retry_after: int):
+        super().__init__(429, "Too many requests.")
+        self._retry_after = retry_after
+
+    @property
+    def retry_after(self) -> int:
+        return self._retry_after
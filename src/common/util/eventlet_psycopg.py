@@ -0,0 +1,26 @@
+import psycopg2
+from eventlet.hubs import trampoline
+from psycopg2 import extensions
+
+
+def eventlet_wait_callback(connection, timeout=-1) -> None:
+    # Yield to the eventlet hub while libpq waits on the socket, instead of blocking
+    # the whole process
+    while True:
+        state = connection.poll()
+
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            trampoline(connection.fileno(), read=True)
+        elif state == extensions.POLL_WRITE:
+            trampoline(connection.fileno(), write=True)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state}")
+
+
+def patch_psycopg() -> None:
+    if not hasattr(extensions, "set_wait_callback"):
+        raise ImportError("psycopg2 does not support wait callbacks.")
+
+    extensions.set_wait_callback(eventlet_wait_callback)
@@ -0,0 +1,84 @@
+import os
+import time
+from socket import gethostname
+from uuid import uuid4
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from src.singleton.metrics import metrics
+
+# Takes the lease in KEYS[1] for ARGV[1] when it's free, or extends it when ARGV[1]
+# already holds it
+ACQUIRE_LEASE_SCRIPT = """
+    local holder = redis.call("GET", KEYS[1])
+
+    if holder == ARGV[1] then
+        redis.call("PEXPIRE", KEYS[1], ARGV[2])
+        return 1
+    end
+
+    if not holder then
+        redis.call("SET", KEYS[1], ARGV[1], "PX", ARGV[2])
+        return 1
+    end
+
+    return 0
+    """
+
+RELEASE_LEASE_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+
+    return 0
+    """
+
+
+class RedisLease:
+    def __init__(self, redis: Redis, key: str, ttl_secs: int) -> None:
+        self._key = key
+        self._ttl_secs = ttl_secs
+        self._acquire = redis.register_script(ACQUIRE_LEASE_SCRIPT)
+        self._release = redis.register_script(RELEASE_LEASE_SCRIPT)
+        self._reset()
+        # A forked process is a different holder, it must not inherit the lease
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def ttl_secs(self) -> int:
+        return self._ttl_secs
+
+    def is_held(self) -> bool:
+        return time.monotonic() < self._held_until
+
+    def renew(self) -> bool:
+        renewed_at = time.monotonic()
+
+        try:
+            acquired = self._acquire(
+                keys=[self._key],
+                args=[self._holder_id, self._ttl_secs * 1000],
+            )
+        except RedisError:
+            # Without Redis the lease can't be confirmed, so it only lasts until the
+            # last renewal runs out
+            acquired = False
+        else:
+            # Counted from before the call, so it never outlives the Redis key
+            self._held_until = renewed_at + self._ttl_secs if acquired else 0.0
+
+        metrics.set_gauge(f"{self._key}_held", int(self.is_held()))
+        return bool(acquired)
+
+    def _reset(self) -> None:
+        self._holder_id = f"{gethostname()}:{os.getpid()}:{uuid4()}"
+        self._held_until = 0.0
+
+    def release(self) -> None:
+        self._held_until = 0.0
+
+        try:
+            self._release(keys=[self._key], args=[self._holder_id])
+        except RedisError:
+            pass
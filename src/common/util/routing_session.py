@@ -0,0 +1,63 @@
+import random
+from typing import Any, Optional
+
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND_PREFIX = "replica_"
+
+
+class RoutingSession(Session):
+    def get_bind(
+        self,
+        mapper: Optional[Any] = None,
+        clause: Optional[Any] = None,
+        bind: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Any:
+        if bind is None and self._can_use_replica(clause):
+            replica_bind_key = self._get_replica_bind_key()
+
+            if replica_bind_key is not None:
+                return self._db.engines[replica_bind_key]
+
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _can_use_replica(self, clause: Optional[Any]) -> bool:
+        if not has_app_context() or not g.get("db_read_only"):
+            return False
+
+        # Writes and row locks always go to the primary
+        if self._flushing or getattr(clause, "is_dml", False):
+            return False
+        return getattr(clause, "_for_update_arg", None) is None
+
+    def _get_replica_bind_key(self) -> Optional[str]:
+        # One replica per app context, so a request doesn't mix replicas lagging
+        # differently
+        if "db_replica_bind_key" not in g:
+            replica_bind_keys = [
+                bind_key
+                for bind_key in self._db.engines
+                if bind_key is not None and bind_key.startswith(REPLICA_BIND_PREFIX)
+            ]
+            g.db_replica_bind_key = (
+                random.choice(replica_bind_keys) if replica_bind_keys else None
+            )
+
+        return g.db_replica_bind_key
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def mark_committed_writes(session: RoutingSession) -> None:
+    if session.info.pop("wrote", False) and has_app_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def forget_rolled_back_writes(session: RoutingSession) -> None:
+    session.info.pop("wrote", None)
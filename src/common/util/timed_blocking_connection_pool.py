@@ -0,0 +1,33 @@
+import time
+
+from redis import BlockingConnectionPool
+from redis.exceptions import ConnectionError
+
+from src.common.exception.http.service_unavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.singleton.metrics import metrics
+
+
+class TimedBlockingConnectionPool(BlockingConnectionPool):
+    def get_connection(self, *args, **kwargs):
+        started_at = time.perf_counter()
+
+        try:
+            return super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            # Only a full pool fails before any connection is attempted
+            if self.pool.empty():
+                metrics.increment("redis_pool_timeouts")
+                raise ServiceUnavailableException()
+            raise
+        finally:
+            metrics.observe("redis_pool_wait_secs", time.perf_counter() - started_at)
+            self._set_usage_gauges()
+
+    def release(self, connection) -> None:
+        super().release(connection)
+        self._set_usage_gauges()
+
+    def _set_usage_gauges(self) -> None:
+        metrics.set_gauge("redis_pool_in_use", self.max_connections - self.pool.qsize())
@@ -0,0 +1,32 @@
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.common.exception.http.service_unavailable_exception import (
+    ServiceUnavailableException,
+)
+from src.singleton.metrics import metrics
+
+
+class TimedQueuePool(QueuePool):
+    def _do_get(self):
+        started_at = time.perf_counter()
+
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            # Waited the whole pool timeout, fail the request instead of queueing more
+            metrics.increment("db_pool_timeouts")
+            raise ServiceUnavailableException()
+        finally:
+            metrics.observe("db_pool_wait_secs", time.perf_counter() - started_at)
+            self._set_usage_gauges()
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._set_usage_gauges()
+
+    def _set_usage_gauges(self) -> None:
+        metrics.set_gauge("db_pool_checked_out", self.checkedout())
+        metrics.set_gauge("db_pool_overflow", max(self.overflow(), 0))
@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Generic, Optional, TypeVar
+
+from src.singleton.metrics import metrics
+
+T = TypeVar("T")
+
+
+class TtlLruCache(Generic[T]):
+    def __init__(self, name: str, max_size: int) -> None:
+        self._name = name
+        self._max_size = max_size
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[T, float]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                metrics.increment(f"{self._name}_misses")
+                return None
+
+            self._entries.move_to_end(key)
+
+        metrics.increment(f"{self._name}_hits")
+        return entry[0]
+
+    def set(self, key: str, value: T, *, expires_at: float) -> None:
+        if self._max_size <= 0 or expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+            metrics.set_gauge(f"{self._name}_size", len(self._entries))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,4 +1,8 @@
+import atexit
+import os
+from datetime import datetime
 from typing import Callable, Union
+from weakref import WeakKeyDictionary
 
 from flask import Blueprint, Flask
 from flask_apscheduler import APScheduler
@@ -6,8 +10,16 @@ from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from flask_socketio import SocketIO
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.middleware.proxy_fix import ProxyFix
 
+from src.common.util.eventlet_psycopg import patch_psycopg
+from src.common.util.routing_session import REPLICA_BIND_PREFIX
+from src.common.util.timed_queue_pool import TimedQueuePool
 from src.singleton.env import env
+from src.singleton.scheduler_lease import scheduler_lease
+
+# Apps whose DB connections a forked worker must not share with its parent
+_apps_with_db: WeakKeyDictionary[Flask, SQLAlchemy] = WeakKeyDictionary()
 
 
 def create_app(
@@ -24,18 +36,51 @@ def create_app(
 
     app.config["SQLALCHEMY_DATABASE_URI"] = env.DB_URL
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "poolclass": TimedQueuePool,
+        "pool_size": env.DB_POOL_SIZE,
+        "max_overflow": env.DB_MAX_OVERFLOW,
+        # Budget for waiting on a connection before the request fails with a 503
+        "pool_timeout": env.DB_POOL_TIMEOUT_SECS,
+        "pool_recycle": env.DB_POOL_RECYCLE_SECS,
+        "pool_pre_ping": env.DB_POOL_PRE_PING,
+    }
+    # Read-only service calls are routed to these by the session
+    app.config["SQLALCHEMY_BINDS"] = {
+        f"{REPLICA_BIND_PREFIX}{index}": url
+        for index, url in enumerate(env.DB_REPLICA_URLS)
+    }
     app.config["SECRET_KEY"] = env.SECRET_KEY
     app.config["SCHEDULER_API_ENABLED"] = False
 
+    # Make psycopg2 cooperative so queries yield to the eventlet hub
+    if env.DB_GREEN_MODE:
+        patch_psycopg()
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
-    socketio.init_app(app, cors_allowed_origins="*")
+    # Emits go through Redis so they reach clients connected to any worker. The polling
+    # requests of a client must all reach the worker that holds its session, so several
+    # workers need a load balancer with sticky sessions (or a port per worker). Without
+    # one, SOCKETIO_WEBSOCKET_ONLY accepts only websockets, which stay on one worker,
+    # and clients must then connect with transports: ["websocket"].
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        message_queue=env.REDIS_URL,
+        transports=["websocket"] if env.SOCKETIO_WEBSOCKET_ONLY else None,
+    )
     marshmallow.init_app(app)
     scheduler.init_app(app)
 
-    # Start CRON jobs
-    scheduler.start()
+    # Behind load balancers, take the client address from X-Forwarded-For so the
+    # per-IP rate limits don't lump every client together. Wrapping after Socket.IO
+    # makes its handlers see the same address.
+    if env.SERVER_PROXY_HOPS:
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app, x_for=env.SERVER_PROXY_HOPS, x_proto=env.SERVER_PROXY_HOPS
+        )
 
     # Register blueprints
     app.register_blueprint(bp)
@@ -48,4 +93,27 @@ def create_app(
     for path, namespace in namespaces.items():
         socketio.on_namespace(namespace(path))
 
+    _apps_with_db[app] = db
+
     return app
+
+
+def reset_db_connections() -> None:
+    for app, db in list(_apps_with_db.items()):
+        with app.app_context():
+            # The primary and every replica bind
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+
+# A forked worker (e.g. gunicorn --preload) opens its own DB connections instead of
+# sharing the parent's sockets. Registered once, as hooks can't be unregistered.
+os.register_at_fork(after_in_child=reset_db_connections)
+
+
+def start_scheduler(scheduler: APScheduler) -> None:
+    scheduler.start()
+    # Try for the lease right away instead of after the first renewal interval
+    scheduler.modify_job("renew_scheduler_lease", next_run_time=datetime.now())
+    # Hand the lease over right away instead of letting it run out
+    atexit.register(scheduler_lease.release)
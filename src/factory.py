@@ -1,14 +1,22 @@
+from flask import Flask
 from marshmallow import ValidationError
 
+# Importing these registers the routes, models and scheduled jobs
+from src import api, model, schedule  # noqa: F401
 from src.api.blueprint.api_bp import api_bp
 from src.api.error_handler import (
     handle_http_exception,
+    handle_too_many_requests_exception,
     handle_unauthorized_exception,
     handle_validation_error,
 )
 from src.common.exception.http.http_exception import HttpException
+from src.common.exception.http.too_many_requests_exception import (
+    TooManyRequestsException,
+)
 from src.common.exception.http.unauthorized_exception import UnauthorizedException
 from src.config import create_app
+from src.service import replica_service, socket_service
 from src.singleton.db import db
 from src.singleton.marshmallow import marshmallow
 from src.singleton.migrate import migrate
@@ -18,21 +26,29 @@ from src.socket.namespace.chat_namespace import ChatNamespace
 
 error_handlers = {
     HttpException: handle_http_exception,
+    TooManyRequestsException: handle_too_many_requests_exception,
     UnauthorizedException: handle_unauthorized_exception,
     ValidationError: handle_validation_error,
 }
 
 namespaces = {
-    "/sockets/chats": ChatNamespace,
+    socket_service.CHAT_NAMESPACE: ChatNamespace,
 }
 
-app = create_app(
-    db,
-    migrate,
-    socketio,
-    marshmallow,
-    scheduler,
-    api_bp,
-    error_handlers,
-    namespaces,
-)
+
+def build_app() -> Flask:
+    app = create_app(
+        db,
+        migrate,
+        socketio,
+        marshmallow,
+        scheduler,
+        api_bp,
+        error_handlers,
+        namespaces,
+    )
+
+    # Keep the user's next reads on the primary after a write
+    app.teardown_request(replica_service.stick_to_primary)
+
+    return app
@@ -1,14 +1,26 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import UUID as SQLAlchemyUUID
+from sqlalchemy import DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.singleton.db import db
+from src.singleton.env import env
 
 
 class Chat(db.Model):
     __tablename__ = "chats"
+    __table_args__ = (
+        UniqueConstraint(
+            "direct_user_low_id",
+            "direct_user_high_id",
+            name="uq_chats_direct_user_pair",
+        ),
+    )
+
+    EXPIRATION_SLACK_SECS = 60
 
     id: Mapped[UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
@@ -18,15 +30,46 @@ class Chat(db.Model):
         nullable=False,
     )
 
+    # Canonical (lowest, highest) participant pair, only set on direct chats
+    direct_user_low_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("users.id"),
+        nullable=True,
+    )
+
+    direct_user_high_id: Mapped[Optional[UUID]] = mapped_column(
+        ForeignKey("users.id"),
+        nullable=True,
+    )
+
+    # Upper bound of the newest message expiration, the chat is empty once it passes
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: Chat.calculate_expiration(),
+        index=True,
+        nullable=False,
+    )
+
     participants: Mapped[List["ChatParticipant"]] = relationship(  # type: ignore
         back_populates="chat",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     messages: Mapped[List["Message"]] = relationship(  # type: ignore
         back_populates="chat",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
+    @staticmethod
+    def calculate_expiration() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(
+            seconds=env.MESSAGE_TTL_SECS + Chat.EXPIRATION_SLACK_SECS
+        )
+
+    @staticmethod
+    def get_direct_user_pair(user_id: UUID, other_user_id: UUID) -> tuple[UUID, UUID]:
+        return min(user_id, other_user_id), max(user_id, other_user_id)
+
     def __repr__(self) -> str:
         return f"<Chat {self.id}>"
@@ -13,7 +13,7 @@ class ChatParticipant(db.Model):
     __table_args__ = (PrimaryKeyConstraint("chat_id", "user_id"),)
 
     chat_id: Mapped[UUID] = mapped_column(
-        ForeignKey("chats.id"),
+        ForeignKey("chats.id", ondelete="CASCADE"),
         nullable=False,
     )
     chat: Mapped["Chat"] = relationship(  # type: ignore
@@ -26,6 +26,7 @@ class ChatParticipant(db.Model):
     messages: Mapped[List["Message"]] = relationship(  # type: ignore
         back_populates="sender",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     @hybrid_property
@@ -3,7 +3,7 @@ from typing import Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy import UUID as SQLAlchemyUUID
-from sqlalchemy import DateTime, ForeignKey, ForeignKeyConstraint, tuple_
+from sqlalchemy import DateTime, ForeignKey, ForeignKeyConstraint, Index, tuple_
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,19 +17,21 @@ class Message(db.Model):
         ForeignKeyConstraint(
             ["sender_chat_id", "sender_user_id"],
             ["chat_participants.chat_id", "chat_participants.user_id"],
+            ondelete="CASCADE",
         ),
+        Index("ix_messages_chat_id_timestamp_id", "chat_id", "timestamp", "id"),
+        {"postgresql_partition_by": "RANGE (expires_at)"},
     )
 
     id: Mapped[UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
         primary_key=True,
         default=uuid4,
-        unique=True,
         nullable=False,
     )
 
     chat_id: Mapped[UUID] = mapped_column(
-        ForeignKey("chats.id"),
+        ForeignKey("chats.id", ondelete="CASCADE"),
         nullable=False,
     )
 
@@ -57,6 +59,8 @@ class Message(db.Model):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: Message.calculate_expiration(),
+        primary_key=True,
+        index=True,
         nullable=False,
     )
 
@@ -40,6 +40,7 @@ class Session(db.Model):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),  # Ensure the column is timezone-aware
         default=lambda: Session.calculate_expiration(),
+        index=True,
         nullable=False,
     )
 
@@ -1 +1,8 @@
-from . import clean_sessions
+from . import (
+    clean_empty_chats,
+    clean_expired_messages,
+    clean_sessions,
+    persist_messages,
+    reap_expired_messages,
+    renew_scheduler_lease,
+)
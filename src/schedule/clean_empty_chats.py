@@ -1,10 +1,12 @@
+from src.schedule.decorator.leader_only import leader_only
 from src.service import chat_service
-from src.singleton.app import app
 from src.singleton.scheduler import scheduler
 
 
-@scheduler.task("cron", id="clean_empty_chats", hour="*/1")
+@scheduler.task("cron", id="clean_empty_chats", minute="*/1")
+@leader_only
 def clean_empty_chats():
-    with app.app_context():
+    with scheduler.app.app_context():
         print("Cleaning empty chats...")
-        chat_service.clean_empty_chats()
+        deleted_count = chat_service.clean_empty_chats()
+        print(f"Deleted {deleted_count} empty chats.")
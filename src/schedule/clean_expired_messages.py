@@ -1,10 +1,15 @@
+from src.schedule.decorator.leader_only import leader_only
 from src.service import chat_service
-from src.singleton.app import app
 from src.singleton.scheduler import scheduler
 
 
 @scheduler.task("cron", id="clean_expired_messages", minute="*/1")
+@leader_only
 def clean_expired_messages():
-    with app.app_context():
+    with scheduler.app.app_context():
         print("Cleaning expired messages...")
-        chat_service.clean_expired_messages()
+        dropped_count, deleted_count = chat_service.clean_expired_messages()
+        print(
+            f"Dropped {dropped_count} expired message partitions and deleted "
+            f"{deleted_count} expired messages."
+        )
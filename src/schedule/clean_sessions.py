@@ -1,10 +1,12 @@
+from src.schedule.decorator.leader_only import leader_only
 from src.service import session_service
-from src.singleton.app import app
 from src.singleton.scheduler import scheduler
 
 
 @scheduler.task("cron", id="clean_sessions", hour="*/1")
+@leader_only
 def clean_expired_sessions():
-    with app.app_context():
+    with scheduler.app.app_context():
         print("Cleaning expired sessions...")
-        session_service.clean_expired_sessions()
+        deleted_count = session_service.clean_expired_sessions()
+        print(f"Deleted {deleted_count} expired sessions.")
@@ -0,0 +1,15 @@
+from functools import wraps
+from typing import Callable
+
+from src.singleton.scheduler_lease import scheduler_lease
+
+
+def leader_only(function: Callable) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        # Every scheduler process fires the job, only the lease holder runs it
+        if not scheduler_lease.is_held():
+            return
+        return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,11 @@
+from src.service import chat_service
+from src.singleton.scheduler import scheduler
+
+
+@scheduler.task("interval", id="persist_messages", seconds=1, max_instances=1)
+def persist_messages():
+    with scheduler.app.app_context():
+        persisted_count = chat_service.persist_message_stream()
+
+        if persisted_count:
+            print(f"Persisted {persisted_count} streamed messages.")
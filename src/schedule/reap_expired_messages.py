@@ -0,0 +1,13 @@
+from src.schedule.decorator.leader_only import leader_only
+from src.service import chat_service
+from src.singleton.scheduler import scheduler
+
+
+@scheduler.task("interval", id="reap_expired_messages", seconds=1, max_instances=1)
+@leader_only
+def reap_expired_messages():
+    with scheduler.app.app_context():
+        reaped_count = chat_service.reap_expired_messages()
+
+        if reaped_count:
+            print(f"Reaped {reaped_count} expired messages.")
@@ -0,0 +1,19 @@
+from src.singleton.env import env
+from src.singleton.scheduler import scheduler
+from src.singleton.scheduler_lease import scheduler_lease
+
+
+@scheduler.task(
+    "interval",
+    id="renew_scheduler_lease",
+    seconds=max(env.SCHEDULER_LEASE_SECS // 3, 1),
+    max_instances=1,
+)
+def renew_scheduler_lease():
+    was_held = scheduler_lease.is_held()
+    is_held = scheduler_lease.renew()
+
+    if is_held and not was_held:
+        print("Became the scheduler leader.")
+    elif was_held and not is_held:
+        print("Lost the scheduler leadership.")
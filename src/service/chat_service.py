@@ -1,9 +1,19 @@
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from socket import gethostname
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from flask_socketio import emit
-from sqlalchemy import func
+from redis.client import Pipeline
+from redis.exceptions import ResponseError
+from sqlalchemy import delete, func, insert, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, selectinload
 
+from src.common.dto.message_cursor import MessageCursor
 from src.common.exception.http.chat_not_found_exception import ChatNotFoundException
 from src.common.exception.http.direct_chat_already_exists_exception import (
     DirectChatAlreadyExistsException,
@@ -11,75 +21,115 @@ from src.common.exception.http.direct_chat_already_exists_exception import (
 from src.model.chat import Chat
 from src.model.chat_participant import ChatParticipant
 from src.model.message import Message
-from src.service import socket_service, user_service
+from src.service import message_partition_service, socket_service, user_service
+from src.service.decorator.read_only import read_only
+from src.singleton.chat_expiration_cache import chat_expiration_cache
 from src.singleton.db import db
+from src.singleton.env import env
+from src.singleton.metrics import metrics
+from src.singleton.redis import redis
+from src.singleton.scheduler_lease import scheduler_lease
+from src.singleton.socketio import socketio
 from src.socket.response_body import ResponseBody
 
+MESSAGES_PAGE_LIMIT = 50
+RECENT_MESSAGES_LIMIT = 20
+MESSAGE_STREAM = "message_stream"
+MESSAGE_STREAM_GROUP = "message_writers"
+MESSAGE_STREAM_CLAIM_IDLE_MILLIS = 30_000
+MESSAGE_DEAD_LETTER_STREAM = "message_stream_dead"
+MESSAGE_DEAD_LETTER_STREAM_MAX_LENGTH = 10_000
+MESSAGE_EXPIRATIONS = "message_expirations"
+MESSAGE_REAPER_BATCH_SIZE = 1000
+CHAT_CLEANUP_BATCH_SIZE = 1000
+CHAT_PARTICIPANTS_CACHE_EXPIRATION_SECS = 60 * 60 * 24  # 1 day
+
+# Atomically pops up to ARGV[2] members scored at or below ARGV[1], with their scores
+pop_due_message_expirations = redis.register_script("""
+    local due = redis.call(
+        "ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "WITHSCORES", "LIMIT", 0, ARGV[2]
+    )
+
+    for i = 1, #due, 2 do
+        redis.call("ZREM", KEYS[1], due[i])
+    end
+
+    return due
+    """)
+
 
 def get_direct_chat_by_participants(user_ids: set[UUID]) -> Optional[Chat]:
     if len(user_ids) != 2:
         return
 
-    # TODO: Update query when implement group chats, because it consideres every chat with 2
-    # participants as a direct chat
-
-    # Get a direct chat by its participant user ids
+    # Single probe on the unique (low, high) pair index
+    direct_user_low_id, direct_user_high_id = Chat.get_direct_user_pair(*user_ids)
     chat = (
-        db.session.query(Chat)  # Query chats
-        .join(ChatParticipant)  # Join with chat participants
-        .filter(ChatParticipant.user_id.in_(user_ids))  # Filter by user IDs
-        .having(
-            db.func.count(ChatParticipant.user_id) == 2
-        )  # Ensure exactly two participants
-        .group_by(Chat.id)  # Group by chat ID
-        .first()  # Get the first result (unique possibility or None)
+        db.session.query(Chat)
+        .filter_by(
+            direct_user_low_id=direct_user_low_id,
+            direct_user_high_id=direct_user_high_id,
+        )
+        .first()
     )
     return chat
 
 
 def create_direct_chat(contact_username: str) -> UUID:
-    with db.session.begin():
-        # Query the current user and contact user to create a for update lock on them
-        current_user = user_service.get_user_by_id_or_raise(
-            user_service.get_current_user().user_id,
-            for_update=True,
-        )
-        contact_user = user_service.get_user_by_username_or_raise(
-            contact_username,
-            for_update=True,
-        )
+    current_user_id = user_service.get_current_user().user_id
+    contact_user_id: Optional[UUID] = None
 
-        if get_direct_chat_by_participants({current_user.id, contact_user.id}):
-            raise DirectChatAlreadyExistsException()
+    try:
+        with db.session.begin():
+            contact_user = user_service.get_user_by_username_or_raise(contact_username)
+            contact_user_id = contact_user.id
 
-        chat = Chat(
-            participants=[  # type: ignore
-                ChatParticipant(user=current_user),  # type: ignore
-                ChatParticipant(user=contact_user),  # type: ignore
-            ]
-        )
+            if get_direct_chat_by_participants({current_user_id, contact_user_id}):
+                raise DirectChatAlreadyExistsException()
 
-        db.session.add(chat)
+            direct_user_low_id, direct_user_high_id = Chat.get_direct_user_pair(
+                current_user_id,
+                contact_user_id,
+            )
+            chat = Chat(
+                direct_user_low_id=direct_user_low_id,  # type: ignore
+                direct_user_high_id=direct_user_high_id,  # type: ignore
+                participants=[  # type: ignore
+                    ChatParticipant(user_id=current_user_id),  # type: ignore
+                    ChatParticipant(user=contact_user),  # type: ignore
+                ],
+            )
+
+            db.session.add(chat)
+    except IntegrityError:
+        # The unique pair constraint rejected a chat created concurrently
+        if contact_user_id and get_direct_chat_by_participants(
+            {current_user_id, contact_user_id}
+        ):
+            raise DirectChatAlreadyExistsException()
+        raise
 
+    add_chat_memberships(chat.id, [current_user_id, contact_user_id])
+    cache_chat_participant_ids(chat.id, [current_user_id, contact_user_id])
     return chat.id
 
 
-def get_all_chats(*, for_socket: bool = False) -> List[Chat]:
-    if for_socket:
-        current_user_id = socket_service.get_socket_session_or_raise().user_data.user_id
-    else:
-        current_user_id = user_service.get_current_user().user_id
+@read_only
+def get_all_chats() -> List[Chat]:
+    current_user_id = user_service.get_current_user().user_id
 
+    # Load everything the chat DTO reads in a fixed number of queries
     chats = (
         db.session.query(Chat)
         .join(ChatParticipant)
         .filter(ChatParticipant.user_id == current_user_id)
+        .options(selectinload(Chat.participants).selectinload(ChatParticipant.user))
         .all()
     )
-
     return chats
 
 
+@read_only
 def get_chat_by_id(
     chat_id: UUID,
     *,
@@ -121,73 +171,577 @@ def get_chat_by_id_or_raise(
     return chat
 
 
-def connect_to_chat(chat: Chat) -> None:
-    socket_service.connect_to_room(str(chat.id))
+@read_only
+def get_messages(
+    chat_id: UUID,
+    *,
+    before: Optional[MessageCursor] = None,
+    after: Optional[MessageCursor] = None,
+    limit: int = MESSAGES_PAGE_LIMIT,
+) -> List[Message]:
+    # Validate chat existence and that the current user participates in it
+    get_chat_by_id_or_raise(chat_id)
+
+    # Keyset pagination over the (chat_id, timestamp, id) index
+    cursor_columns = tuple_(Message.timestamp, Message.id)
+    query = db.session.query(Message).filter(
+        Message.chat_id == chat_id, Message.expires_at > func.now()
+    )
+
+    if after:
+        return (
+            query.filter(cursor_columns > (after.timestamp, after.message_id))
+            .order_by(Message.timestamp, Message.id)
+            .limit(limit)
+            .all()
+        )
+
+    if before:
+        query = query.filter(cursor_columns < (before.timestamp, before.message_id))
+
+    messages = (
+        query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit).all()
+    )
+    messages.reverse()
+    return messages
+
+
+@read_only
+def get_recent_messages(
+    chat_ids: List[UUID],
+    *,
+    limit: int = RECENT_MESSAGES_LIMIT,
+) -> dict[UUID, List[Message]]:
+    if not chat_ids:
+        return {}
+
+    # Newest messages of every chat in a single query. Each chat reads only its own
+    # latest rows, backwards along the (chat_id, timestamp, id) index.
+    chats = select(Chat.id).where(Chat.id.in_(chat_ids)).subquery()
+    chat_recent_messages = (
+        select(Message)
+        .where(Message.chat_id == chats.c.id, Message.expires_at > func.now())
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(limit)
+        .lateral()
+    )
+    recent_message = aliased(Message, chat_recent_messages)
+
+    messages = (
+        db.session.query(recent_message)
+        .select_from(chats)
+        .join(chat_recent_messages, true())
+        .order_by(recent_message.chat_id, recent_message.timestamp, recent_message.id)
+        .all()
+    )
+
+    recent_messages: dict[UUID, List[Message]] = {chat_id: [] for chat_id in chat_ids}
+
+    for message in messages:
+        recent_messages[message.chat_id].append(message)
 
+    return recent_messages
 
-def connect_to_all_chats() -> None:
-    chats = get_all_chats(for_socket=True)
 
-    for chat in chats:
-        connect_to_chat(chat)
+def add_chat_memberships(chat_id: UUID, user_ids: List[UUID]) -> None:
+    pipeline = redis.pipeline(transaction=False)
+
+    for user_id in user_ids:
+        pipeline.sadd(f"user_chats:{user_id}", str(chat_id))
+
+    pipeline.execute()
+
+
+def remove_chat_memberships(chat_id: UUID, user_ids: List[UUID]) -> None:
+    pipeline = redis.pipeline(transaction=False)
+
+    for user_id in user_ids:
+        pipeline.srem(f"user_chats:{user_id}", str(chat_id))
+
+    pipeline.execute()
+
+
+def is_chat_participant(chat_id: UUID, user_id: UUID) -> bool:
+    if redis.sismember(f"user_chats:{user_id}", str(chat_id)):
+        return True
+
+    # Not in the membership index, e.g. chats created before it existed
+    is_participant = db.session.query(
+        db.session.query(ChatParticipant)
+        .filter_by(chat_id=chat_id, user_id=user_id)
+        .exists()
+    ).scalar()
+
+    if is_participant:
+        add_chat_memberships(chat_id, [user_id])
+
+    return bool(is_participant)
+
+
+def cache_chat_participant_ids(chat_id: UUID, user_ids: List[UUID]) -> None:
+    key = f"chat_participants:{chat_id}"
+    pipeline = redis.pipeline()
+    pipeline.delete(key)
+    pipeline.sadd(key, *(str(user_id) for user_id in user_ids))
+    pipeline.expire(key, CHAT_PARTICIPANTS_CACHE_EXPIRATION_SECS)
+    pipeline.execute()
+
+
+def get_chat_participant_ids(chat_id: UUID) -> List[UUID]:
+    cached_user_ids: set[str] = redis.smembers(f"chat_participants:{chat_id}")  # type: ignore
+
+    if cached_user_ids:
+        return [UUID(user_id) for user_id in cached_user_ids]
+
+    user_ids = list(
+        db.session.execute(
+            select(ChatParticipant.user_id).where(ChatParticipant.chat_id == chat_id)
+        ).scalars()
+    )
+
+    if user_ids:
+        cache_chat_participant_ids(chat_id, user_ids)
+
+    return user_ids
+
+
+def emit_to_chat(
+    event: str,
+    body: ResponseBody,
+    chat_id: UUID,
+    *,
+    participant_ids: Optional[List[UUID]] = None,
+) -> None:
+    if participant_ids is None:
+        participant_ids = get_chat_participant_ids(chat_id)
+
+    if not participant_ids:
+        return
+
+    # Sockets only join their user's room, so chat events go to every participant's
+    socketio.emit(
+        event,
+        body.to_dict(),
+        to=[socket_service.get_user_room(user_id) for user_id in participant_ids],
+        namespace=socket_service.CHAT_NAMESPACE,
+    )
 
 
 def send_message(chat_id: UUID, content: str) -> Message:
-    with db.session.begin():
-        user_id = socket_service.get_socket_session_or_raise().user_data.user_id
-        # Validate chat existence and create a for update lock on it
-        get_chat_by_id_or_raise(chat_id, for_update=True, for_socket=True)
-        message = Message(
-            chat_id=chat_id,  # type: ignore
-            sender_chat_id=chat_id,  # type: ignore
-            sender_user_id=user_id,  # type: ignore
-            content=content,  # type: ignore
-        )
-        db.session.add(message)
+    user_id = socket_service.get_socket_session_or_raise().user_data.user_id
+
+    if env.MESSAGE_INGESTION_MODE == "stream":
+        return _enqueue_message(chat_id, user_id, content)
+
+    # Membership is enforced by the (sender_chat_id, sender_user_id) foreign key, so
+    # senders don't serialize on a lock over the chat row
+    try:
+        with db.session.begin():
+            # Rejects non participants before the insert, usually without a query
+            if not is_chat_participant(chat_id, user_id):
+                raise ChatNotFoundException()
+
+            inserted_message = db.session.execute(
+                insert(Message)
+                .values(
+                    chat_id=chat_id,
+                    sender_chat_id=chat_id,
+                    sender_user_id=user_id,
+                    content=content,
+                )
+                .returning(Message.id, Message.timestamp, Message.expires_at)
+            ).one()
+            extended_expirations = extend_chat_expirations(
+                {chat_id: inserted_message.expires_at}
+            )
+    except IntegrityError:
+        # The chat is gone, so the membership index entry is stale
+        remove_chat_memberships(chat_id, [user_id])
+        raise ChatNotFoundException()
+
+    cache_chat_expirations(extended_expirations)
+
+    message = Message(
+        id=inserted_message.id,  # type: ignore
+        chat_id=chat_id,  # type: ignore
+        sender_chat_id=chat_id,  # type: ignore
+        sender_user_id=user_id,  # type: ignore
+        content=content,  # type: ignore
+        timestamp=inserted_message.timestamp,  # type: ignore
+        expires_at=inserted_message.expires_at,  # type: ignore
+    )
+    schedule_message_expiration(message)
 
     return message
 
 
-def clean_expired_messages() -> None:
-    with db.session.begin():
-        expired_messages = (
-            db.session.query(Message)
-            .filter(Message.expires_at < db.func.now())
-            .with_for_update()
-            .all()
-        )
+def _enqueue_message(chat_id: UUID, user_id: UUID, content: str) -> Message:
+    if not is_chat_participant(chat_id, user_id):
+        raise ChatNotFoundException()
+
+    # The id and timestamps are assigned here so the message can be fanned out before
+    # it is persisted, and so a replayed stream entry is inserted only once
+    message = Message(
+        id=uuid4(),  # type: ignore
+        chat_id=chat_id,  # type: ignore
+        sender_chat_id=chat_id,  # type: ignore
+        sender_user_id=user_id,  # type: ignore
+        content=content,  # type: ignore
+        timestamp=datetime.now(timezone.utc),  # type: ignore
+        expires_at=Message.calculate_expiration(),  # type: ignore
+    )
+    pipeline = redis.pipeline()
+    pipeline.xadd(
+        MESSAGE_STREAM,
+        {
+            "id": str(message.id),
+            "chat_id": str(message.chat_id),
+            "sender_user_id": str(message.sender_user_id),
+            "content": message.content,
+            "timestamp": message.timestamp.isoformat(),
+            "expires_at": message.expires_at.isoformat(),
+        },
+    )
+    schedule_message_expiration(message, pipeline=pipeline)
+    pipeline.execute()
+
+    return message
+
+
+def schedule_message_expiration(
+    message: Message,
+    *,
+    pipeline: Optional[Pipeline] = None,
+) -> None:
+    (pipeline or redis).zadd(
+        MESSAGE_EXPIRATIONS,
+        {f"{message.chat_id}:{message.id}": message.expires_at.timestamp()},
+    )
+
+
+def reap_expired_messages() -> int:
+    reaped_count = 0
+
+    # Batch by batch only while leading, so a node that lost the lease stops before
+    # the next one takes over
+    while scheduler_lease.is_held():
+        now = time.time()
+        due_entries: List[str] = pop_due_message_expirations(
+            keys=[MESSAGE_EXPIRATIONS],
+            args=[now, MESSAGE_REAPER_BATCH_SIZE],
+        )  # type: ignore
+
+        if not due_entries:
+            break
+
+        members, scores = due_entries[0::2], due_entries[1::2]
+        # How late the oldest popped entry is being reaped
+        metrics.set_gauge("message_reaper_lag_secs", now - float(scores[0]))
+
+        # Expired rows are already hidden from reads and are reclaimed with their
+        # partition, so reaping only announces them
+        due_messages = [
+            (UUID(message_id), UUID(chat_id))
+            for chat_id, message_id in (member.split(":", 1) for member in members)
+        ]
+        emit_expired_messages(due_messages)
+
+        reaped_count += len(due_messages)
+        metrics.increment("message_reaper_reaped", len(due_messages))
+
+        if len(members) < MESSAGE_REAPER_BATCH_SIZE:
+            break
+
+    metrics.set_gauge(
+        "message_reaper_backlog",
+        redis.zcount(MESSAGE_EXPIRATIONS, "-inf", time.time()),  # type: ignore
+    )
+
+    return reaped_count
 
-        for message in expired_messages:
-            db.session.delete(message)
 
-    for message in expired_messages:
-        emit(
-            "message_expired",
+def emit_expired_messages(expired_messages: List[tuple[UUID, UUID]]) -> None:
+    expired_message_ids_by_chat: dict[UUID, List[str]] = defaultdict(list)
+
+    for message_id, chat_id in expired_messages:
+        expired_message_ids_by_chat[chat_id].append(str(message_id))
+
+    # One event per chat instead of one per message
+    for chat_id, message_ids in expired_message_ids_by_chat.items():
+        emit_to_chat(
+            "messages_expired",
             ResponseBody(
-                "Message expired.",
-                {"id": str(message.id)},
-            ).to_dict(),
-            to=str(message.chat_id),
+                "Messages expired.",
+                {"chat_id": str(chat_id), "ids": message_ids},
+            ),
+            chat_id,
         )
 
 
-def clean_empty_chats() -> None:
-    with db.session.begin():
-        empty_chats = (
-            db.session.query(Chat)
-            .outerjoin(Chat.messages)
-            .group_by(Chat.id)
-            .having(func.count(Message.id) == 0)
-            .all()
+def persist_message_stream() -> int:
+    # In direct mode the stream only needs draining of what was left by a switch from
+    # stream mode, so it isn't created, claimed or blocked on while it's empty
+    if env.MESSAGE_INGESTION_MODE != "stream" and not redis.xlen(MESSAGE_STREAM):
+        return 0
+
+    _create_message_stream_group()
+    consumer_name = f"{gethostname()}:{os.getpid()}"
+    persisted_count = 0
+
+    # Take over entries delivered to consumers that died before acknowledging them
+    _claim_stale_stream_entries(consumer_name)
+
+    while entries := _read_message_stream_batch(consumer_name):
+        _persist_stream_entries(entries)
+        persisted_count += len(entries)
+
+    return persisted_count
+
+
+def _create_message_stream_group() -> None:
+    try:
+        redis.xgroup_create(MESSAGE_STREAM, MESSAGE_STREAM_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _claim_stale_stream_entries(consumer_name: str) -> None:
+    start_id = "0-0"
+
+    while True:
+        response = redis.xautoclaim(
+            MESSAGE_STREAM,
+            MESSAGE_STREAM_GROUP,
+            consumer_name,
+            min_idle_time=MESSAGE_STREAM_CLAIM_IDLE_MILLIS,
+            start_id=start_id,
+            count=env.MESSAGE_BATCH_SIZE,
         )
+        start_id = response[0]  # type: ignore
+
+        if start_id == "0-0":
+            break
+
+
+def _read_message_stream_batch(consumer_name: str) -> List[tuple[str, dict]]:
+    batch_size = env.MESSAGE_BATCH_SIZE
+
+    # Entries already delivered to this consumer but not acknowledged come first
+    response = redis.xreadgroup(
+        MESSAGE_STREAM_GROUP,
+        consumer_name,
+        {MESSAGE_STREAM: "0"},
+        count=batch_size,
+    )
+    entries: List[tuple[str, dict]] = response[0][1] if response else []  # type: ignore
+
+    if entries:
+        return entries
+
+    # A batch is closed when it is full or when its time window has elapsed
+    deadline = time.monotonic() + env.MESSAGE_BATCH_WINDOW_MILLIS / 1000
 
-        for empty_chat in empty_chats:
-            emit(
+    while len(entries) < batch_size:
+        remaining_millis = int((deadline - time.monotonic()) * 1000)
+
+        if remaining_millis <= 0:
+            break
+
+        response = redis.xreadgroup(
+            MESSAGE_STREAM_GROUP,
+            consumer_name,
+            {MESSAGE_STREAM: ">"},
+            count=batch_size - len(entries),
+            block=remaining_millis,
+        )
+
+        if not response:
+            break
+
+        entries.extend(response[0][1])  # type: ignore
+
+    return entries
+
+
+def _persist_stream_entries(entries: List[tuple[str, dict]]) -> None:
+    rows = [
+        {
+            "id": UUID(fields["id"]),
+            "chat_id": UUID(fields["chat_id"]),
+            "sender_chat_id": UUID(fields["chat_id"]),
+            "sender_user_id": UUID(fields["sender_user_id"]),
+            "content": fields["content"],
+            "timestamp": datetime.fromisoformat(fields["timestamp"]),
+            "expires_at": datetime.fromisoformat(fields["expires_at"]),
+        }
+        for _, fields in entries
+    ]
+
+    rejected_entries: List[tuple[str, dict]] = []
+
+    try:
+        with db.session.begin():
+            extended_expirations = _insert_messages(rows)
+
+        cache_chat_expirations(extended_expirations)
+    except IntegrityError:
+        # Some chat was deleted before its messages were persisted, so insert one by
+        # one to keep the rest of the batch
+        for entry, row in zip(entries, rows):
+            try:
+                with db.session.begin():
+                    extended_expirations = _insert_messages([row])
+
+                cache_chat_expirations(extended_expirations)
+            except IntegrityError:
+                rejected_entries.append(entry)
+
+    # Acknowledge only after commit; a replay after a crash is a no-op on the ids
+    stream_ids = [stream_id for stream_id, _ in entries]
+    pipeline = redis.pipeline()
+
+    # Rejected rows are kept aside in the same transaction as the ack, so none is lost
+    for _, fields in rejected_entries:
+        pipeline.xadd(
+            MESSAGE_DEAD_LETTER_STREAM,
+            fields,
+            maxlen=MESSAGE_DEAD_LETTER_STREAM_MAX_LENGTH,
+            approximate=True,
+        )
+
+    pipeline.xack(MESSAGE_STREAM, MESSAGE_STREAM_GROUP, *stream_ids)
+    pipeline.xdel(MESSAGE_STREAM, *stream_ids)
+    pipeline.execute()
+
+    if rejected_entries:
+        metrics.increment("message_stream_dead_lettered", len(rejected_entries))
+        print(
+            f"Moved {len(rejected_entries)} unpersistable streamed messages to "
+            f"{MESSAGE_DEAD_LETTER_STREAM}: "
+            f"{', '.join(fields['id'] for _, fields in rejected_entries)}."
+        )
+
+
+def _insert_messages(rows: List[dict]) -> dict[UUID, datetime]:
+    db.session.execute(
+        postgresql_insert(Message)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["id", "expires_at"])
+    )
+
+    latest_expirations: dict[UUID, datetime] = {}
+
+    for row in rows:
+        latest_expirations[row["chat_id"]] = max(
+            row["expires_at"],
+            latest_expirations.get(row["chat_id"], row["expires_at"]),
+        )
+
+    return extend_chat_expirations(latest_expirations)
+
+
+def extend_chat_expirations(
+    latest_expirations: dict[UUID, datetime],
+) -> dict[UUID, datetime]:
+    slack = timedelta(seconds=Chat.EXPIRATION_SLACK_SECS)
+    known_expirations: dict[UUID, datetime] = {}
+
+    # Chat.expires_at stays an upper bound of its newest message expiration. Bumping
+    # it past that by a slack means busy chats only write their row once per slack.
+    for chat_id, expires_at in latest_expirations.items():
+        # Already known to outlive the message, so the hot chat row isn't touched
+        known_expiration = chat_expiration_cache.get(str(chat_id))
+
+        if known_expiration is not None and known_expiration >= expires_at:
+            continue
+
+        extended_expiration = db.session.execute(
+            update(Chat)
+            .where(Chat.id == chat_id, Chat.expires_at < expires_at)
+            .values(expires_at=expires_at + slack)
+            .returning(Chat.expires_at)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        # Not updated means the chat already expires at or after the message
+        known_expirations[chat_id] = extended_expiration or expires_at
+
+    return known_expirations
+
+
+def cache_chat_expirations(known_expirations: dict[UUID, datetime]) -> None:
+    # Only once committed, a rolled back extension must not be skipped next time
+    for chat_id, expires_at in known_expirations.items():
+        chat_expiration_cache.set(
+            str(chat_id), expires_at, expires_at=expires_at.timestamp()
+        )
+
+
+def clean_expired_messages() -> tuple[int, int]:
+    # Fully expired partitions go at once, only rows that missed a partition are
+    # deleted one by one
+    message_partition_service.create_message_partitions()
+    dropped_count = message_partition_service.drop_expired_message_partitions()
+    deleted_count = message_partition_service.clean_default_message_partition()
+
+    metrics.increment("message_cleanup_deleted", deleted_count)
+    return dropped_count, deleted_count
+
+
+def clean_empty_chats() -> int:
+    deleted_count = 0
+
+    while scheduler_lease.is_held():
+        with db.session.begin():
+            # Every message of an expired chat has expired as well
+            expired_chat_ids = (
+                db.session.execute(
+                    select(Chat.id)
+                    .where(Chat.expires_at < db.func.now())
+                    .limit(CHAT_CLEANUP_BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )
+                .scalars()
+                .all()
+            )
+
+            if not expired_chat_ids:
+                break
+
+            participants = db.session.execute(
+                select(ChatParticipant.chat_id, ChatParticipant.user_id).where(
+                    ChatParticipant.chat_id.in_(expired_chat_ids)
+                )
+            ).all()
+
+            # Participants and leftover messages go with ON DELETE CASCADE
+            db.session.execute(
+                delete(Chat)
+                .where(Chat.id.in_(expired_chat_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+        participant_ids_by_chat: dict[UUID, List[UUID]] = defaultdict(list)
+
+        for chat_id, user_id in participants:
+            participant_ids_by_chat[chat_id].append(user_id)
+
+        for chat_id in expired_chat_ids:
+            emit_to_chat(
                 "chat_deleted",
                 ResponseBody(
                     "Deleting chat due to inactivity.",
-                    {"id": str(empty_chat.id)},
-                ).to_dict(),
-                to=str(empty_chat.id),
+                    {"id": str(chat_id)},
+                ),
+                chat_id,
+                participant_ids=participant_ids_by_chat[chat_id],
             )
-            db.session.delete(empty_chat)
+            remove_chat_memberships(chat_id, participant_ids_by_chat[chat_id])
+            redis.delete(f"chat_participants:{chat_id}")
+
+        deleted_count += len(expired_chat_ids)
+
+        if len(expired_chat_ids) < CHAT_CLEANUP_BATCH_SIZE:
+            break
+
+    return deleted_count
@@ -0,0 +1,24 @@
+from functools import wraps
+from typing import Callable
+
+from flask import g
+
+from src.service import replica_service
+from src.singleton.env import env
+
+
+def read_only(function: Callable) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        # Nested read-only calls keep the routing chosen by the outermost one
+        if not env.DB_REPLICA_URLS or "db_read_only" in g:
+            return function(*args, **kwargs)
+
+        g.db_read_only = not replica_service.should_read_from_primary()
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            g.pop("db_read_only")
+
+    return wrapper
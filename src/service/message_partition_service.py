@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from psycopg2 import errorcodes
+from sqlalchemy import TextClause, text
+from sqlalchemy.exc import DBAPIError
+
+from src.singleton.db import db
+from src.singleton.env import env
+from src.singleton.metrics import metrics
+from src.singleton.scheduler_lease import scheduler_lease
+
+PARTITION_INTERVAL = timedelta(hours=1)
+PARTITION_LOOKAHEAD = timedelta(hours=3)
+PARTITION_PREFIX = "messages_p"
+PARTITION_NAME_FORMAT = "%Y%m%d%H"
+DEFAULT_PARTITION = "messages_default"
+DEFAULT_PARTITION_CLEANUP_BATCH_SIZE = 1000
+# Attaching or dropping a partition locks the whole messages table. Queued behind a long
+# read, the DDL would hold up every insert and read after it, so it gives up quickly and
+# is retried on the next run instead.
+PARTITION_DDL_LOCK_TIMEOUT_MILLIS = 1000
+
+
+def get_partition_start(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def get_partition_name(partition_start: datetime) -> str:
+    return f"{PARTITION_PREFIX}{partition_start.strftime(PARTITION_NAME_FORMAT)}"
+
+
+def get_message_partition_names() -> List[str]:
+    return list(db.session.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                WHERE parent.relname = 'messages'
+                """)).scalars())
+
+
+def execute_partition_ddl(
+    partition_name: str,
+    statement: TextClause,
+    params: Optional[dict] = None,
+    *,
+    benign_error_code: Optional[str] = None,
+) -> bool:
+    try:
+        with db.session.begin():
+            db.session.execute(
+                text(f"SET LOCAL lock_timeout = {PARTITION_DDL_LOCK_TIMEOUT_MILLIS}")
+            )
+            db.session.execute(statement, params)
+        return True
+    except DBAPIError as e:
+        error_code = getattr(e.orig, "pgcode", None)
+
+        if error_code == errorcodes.LOCK_NOT_AVAILABLE:
+            metrics.increment("message_partition_lock_timeouts")
+        elif error_code != benign_error_code:
+            raise
+
+        print(f"Could not change message partition {partition_name}, retrying later.")
+        return False
+
+
+def create_message_partitions() -> int:
+    now = datetime.now(timezone.utc)
+    # Every message expires within the TTL, so that's how far ahead rows can land
+    horizon = now + timedelta(seconds=env.MESSAGE_TTL_SECS) + PARTITION_LOOKAHEAD
+
+    with db.session.begin():
+        existing_partitions = set(get_message_partition_names())
+
+    created_count = 0
+    partition_start = get_partition_start(now)
+
+    while partition_start < horizon:
+        partition_name = get_partition_name(partition_start)
+
+        if partition_name not in existing_partitions and execute_partition_ddl(
+            partition_name,
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{partition_name}" '
+                "PARTITION OF messages FOR VALUES FROM (:start) TO (:end)"
+            ),
+            {"start": partition_start, "end": partition_start + PARTITION_INTERVAL},
+            # The default partition already holds rows of this range. They expire
+            # within the TTL, after which the partition can be created.
+            benign_error_code=errorcodes.CHECK_VIOLATION,
+        ):
+            created_count += 1
+
+        partition_start += PARTITION_INTERVAL
+
+    return created_count
+
+
+def drop_expired_message_partitions() -> int:
+    now = datetime.now(timezone.utc)
+
+    with db.session.begin():
+        partition_names = get_message_partition_names()
+
+    dropped_count = 0
+
+    for partition_name in partition_names:
+        if not scheduler_lease.is_held():
+            break
+
+        if not partition_name.startswith(PARTITION_PREFIX):
+            continue
+
+        partition_start = datetime.strptime(
+            partition_name.removeprefix(PARTITION_PREFIX), PARTITION_NAME_FORMAT
+        ).replace(tzinfo=timezone.utc)
+
+        # Only partitions whose whole range has expired, the boundary one is left to
+        # the read filters until it's due
+        if partition_start + PARTITION_INTERVAL > now:
+            continue
+
+        if execute_partition_ddl(
+            partition_name, text(f'DROP TABLE IF EXISTS "{partition_name}"')
+        ):
+            dropped_count += 1
+
+    metrics.increment("message_partitions_dropped", dropped_count)
+    return dropped_count
+
+
+def clean_default_message_partition() -> int:
+    deleted_count = 0
+
+    while scheduler_lease.is_held():
+        with db.session.begin():
+            deleted_rows = db.session.execute(
+                text(f"""
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE ctid IN (
+                        SELECT ctid FROM {DEFAULT_PARTITION}
+                        WHERE expires_at < now()
+                        LIMIT :limit
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    """),
+                {"limit": DEFAULT_PARTITION_CLEANUP_BATCH_SIZE},
+            ).rowcount
+
+        deleted_count += deleted_rows
+
+        if deleted_rows < DEFAULT_PARTITION_CLEANUP_BATCH_SIZE:
+            break
+
+    return deleted_count
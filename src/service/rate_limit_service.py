@@ -0,0 +1,73 @@
+import math
+from typing import Optional
+from uuid import UUID
+
+from src.common.dto.rate_limit import RateLimit
+from src.common.exception.http.too_many_requests_exception import (
+    TooManyRequestsException,
+)
+from src.singleton.metrics import metrics
+from src.singleton.redis import redis
+
+# Refills every bucket in KEYS and takes a token from each of them, or from none if any
+# is empty. ARGV holds the capacity and refill rate of every key, in order. Returns 0
+# when allowed, otherwise the seconds until all buckets hold a token again.
+take_tokens = redis.register_script("""
+    local time = redis.call("TIME")
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local tokens = {}
+    local retry_after = 0
+
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2 - 1])
+        local refill_rate = tonumber(ARGV[i * 2])
+        local bucket = redis.call("HMGET", key, "tokens", "updated_at")
+        local available = tonumber(bucket[1]) or capacity
+        local updated_at = tonumber(bucket[2]) or now
+
+        tokens[i] = math.min(capacity, available + (now - updated_at) * refill_rate)
+
+        if tokens[i] < 1 then
+            retry_after = math.max(retry_after, (1 - tokens[i]) / refill_rate)
+        end
+    end
+
+    if retry_after > 0 then
+        return tostring(retry_after)
+    end
+
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2 - 1])
+        local refill_rate = tonumber(ARGV[i * 2])
+
+        redis.call("HSET", key, "tokens", tokens[i] - 1, "updated_at", now)
+        redis.call("EXPIRE", key, math.ceil(capacity / refill_rate))
+    end
+
+    return "0"
+    """)
+
+
+def get_user_key(event: str, user_id: UUID) -> str:
+    return f"rate_limit:{event}:user:{user_id}"
+
+
+def get_ip_key(event: str, ip: Optional[str]) -> str:
+    return f"rate_limit:{event}:ip:{ip}"
+
+
+def take_token(limits: dict[str, RateLimit]) -> None:
+    if not limits:
+        return
+
+    args = []
+
+    for limit in limits.values():
+        args.extend([limit.capacity, limit.refill_per_sec])
+
+    # A single round trip for all of the buckets
+    retry_after = float(take_tokens(keys=list(limits), args=args))  # type: ignore
+
+    if retry_after > 0:
+        metrics.increment("rate_limited")
+        raise TooManyRequestsException(math.ceil(retry_after))
@@ -0,0 +1,42 @@
+from typing import Optional
+from uuid import UUID
+
+from flask import g, request
+
+from src.service import socket_service
+from src.singleton.env import env
+from src.singleton.redis import redis
+
+
+def get_primary_reads_key(user_id: UUID) -> str:
+    return f"primary_reads:{user_id}"
+
+
+def get_current_user_id() -> Optional[UUID]:
+    user_id: Optional[UUID] = g.get("current_user_id")
+
+    if user_id is None and getattr(request, "sid", None):
+        socket_session = socket_service.get_socket_session()
+        user_id = socket_session.user_data.user_id if socket_session else None
+
+    return user_id
+
+
+def should_read_from_primary() -> bool:
+    # Writes of this request, or recent ones of the same user, may not have reached the
+    # replicas yet
+    if g.get("db_wrote"):
+        return True
+
+    user_id = get_current_user_id()
+    return bool(user_id and redis.exists(get_primary_reads_key(user_id)))
+
+
+def stick_to_primary(exception: Optional[BaseException] = None) -> None:
+    if not env.DB_REPLICA_URLS or not g.pop("db_wrote", False):
+        return
+
+    user_id = get_current_user_id()
+
+    if user_id:
+        redis.set(get_primary_reads_key(user_id), 1, ex=env.DB_REPLICA_STICKINESS_SECS)
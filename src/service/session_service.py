@@ -1,10 +1,16 @@
+import hashlib
 import json
+import math
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Literal, Optional, Union, overload
 from uuid import UUID
 
 import jwt
 from flask import Response, g, request
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.orm import joinedload
 
 from src.common.dto.jwt_payload import JwtPayload
 from src.common.dto.session_data import SessionData
@@ -16,6 +22,27 @@ from src.model.session import Session
 from src.service import user_service
 from src.singleton.db import db
 from src.singleton.env import env
+from src.singleton.jwt_cache import jwt_cache
+from src.singleton.redis import redis
+from src.singleton.scheduler_lease import scheduler_lease
+
+REFRESH_LOCK_TIMEOUT_SECS = 5
+REFRESH_WAIT_INTERVAL_SECS = 0.05
+# Outlasts any lookup that read the session row before it was rotated or deleted
+REVOKED_SESSION_TOMBSTONE_SECS = 60
+
+# Caches the session data in KEYS[1] for ARGV[1] seconds, unless the refresh token was
+# revoked meanwhile and left a tombstone in KEYS[2]. ARGV holds the flattened fields
+# after the TTL.
+cache_session_data = redis.register_script("""
+    if redis.call("EXISTS", KEYS[2]) == 1 then
+        return 0
+    end
+
+    redis.call("HSET", KEYS[1], unpack(ARGV, 2))
+    redis.call("EXPIRE", KEYS[1], ARGV[1])
+    return 1
+    """)
 
 
 def create_session(user_id: UUID) -> Session:
@@ -45,14 +72,27 @@ def create_jwt(session_id: UUID, user_id: UUID, username: str, name: str) -> str
     return jwt.encode(payload.to_dict(), env.JWT_SECRET_KEY, algorithm="HS256")
 
 
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def decode_jwt(token: str) -> JwtPayload:
+    token_hash = hash_token(token)
+    cached_payload = jwt_cache.get(token_hash)
+
+    if cached_payload is not None:
+        return cached_payload
+
     try:
         decoded_jwt = jwt.decode(token, env.JWT_SECRET_KEY, algorithms=["HS256"])
         payload = JwtPayload.from_dict(decoded_jwt)
-        return payload
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
         raise UnauthorizedException()
 
+    # Only verified tokens reach this point, and they are evicted at their exp
+    jwt_cache.set(token_hash, payload, expires_at=payload.exp)
+    return payload
+
 
 def set_new_tokens(auth_token: str, refresh_token: str) -> None:
     g.auth_token = auth_token
@@ -127,12 +167,12 @@ def set_current_session_data(
         g.current_username = payload_data.user_data.username
         g.current_name = payload_data.user_data.name
     elif refresh_token:
-        session = get_session_by_refresh_token_or_raise(refresh_token)
+        session_data = get_session_data_by_refresh_token_or_raise(refresh_token)
 
-        g.current_session_id = session.id
-        g.current_user_id = session.user_id
-        g.current_username = session.user.username
-        g.current_name = session.user.name
+        g.current_session_id = session_data.session_id
+        g.current_user_id = session_data.user_data.user_id
+        g.current_username = session_data.user_data.username
+        g.current_name = session_data.user_data.name
     else:
         ValueError("It is required to insert either auth token or refresh token.")
 
@@ -220,8 +260,92 @@ def get_session_by_refresh_token_or_raise(
     return session
 
 
-def validate_refresh_token(refresh_token: str) -> None:
-    get_session_by_refresh_token_or_raise(refresh_token)
+def get_session_data_key(refresh_token: str) -> str:
+    return f"session_data:{hash_token(refresh_token)}"
+
+
+def get_revoked_session_key(refresh_token: str) -> str:
+    return f"session_revoked:{hash_token(refresh_token)}"
+
+
+def get_session_data_by_refresh_token(refresh_token: str) -> Optional[SessionData]:
+    key = get_session_data_key(refresh_token)
+
+    # The cache is only a shortcut, so an unreachable or malformed entry is a miss
+    try:
+        cached_session_data: dict = redis.hgetall(key)  # type: ignore
+    except RedisError:
+        cached_session_data = {}
+
+    if cached_session_data:
+        try:
+            return SessionData.from_flattened(cached_session_data)
+        except (KeyError, ValueError):
+            pass
+
+    session = (
+        db.session.query(Session)
+        .options(joinedload(Session.user, innerjoin=True))
+        .filter_by(refresh_token=refresh_token)
+        .first()
+    )
+
+    if session is None or session.expires_at < datetime.now(timezone.utc):
+        return None
+
+    session_data = SessionData(
+        session_id=session.id,
+        user_data=UserData(
+            user_id=session.user_id,
+            username=session.user.username,
+            name=session.user.name,
+        ),
+    )
+
+    # Write through with a short TTL, never past the session expiration. A rotation or
+    # signout that committed after the row was read leaves a tombstone that skips this.
+    ttl_secs = min(
+        env.SESSION_CACHE_TTL_SECS,
+        math.ceil((session.expires_at - datetime.now(timezone.utc)).total_seconds()),
+    )
+    try:
+        cache_session_data(
+            keys=[key, get_revoked_session_key(refresh_token)],
+            args=[
+                ttl_secs,
+                *(item for field in session_data.flatten().items() for item in field),
+            ],
+        )
+    except RedisError:
+        pass
+
+    return session_data
+
+
+def get_session_data_by_refresh_token_or_raise(refresh_token: str) -> SessionData:
+    session_data = get_session_data_by_refresh_token(refresh_token)
+
+    if session_data is None:
+        raise SessionNotFoundException()
+    return session_data
+
+
+def delete_cached_session_data(*refresh_tokens: str) -> None:
+    if refresh_tokens:
+        # The tombstones keep lookups that are still in flight from caching it again
+        pipeline = redis.pipeline()
+
+        for refresh_token in refresh_tokens:
+            pipeline.set(
+                get_revoked_session_key(refresh_token),
+                1,
+                ex=REVOKED_SESSION_TOMBSTONE_SECS,
+            )
+
+        pipeline.delete(
+            *(get_session_data_key(refresh_token) for refresh_token in refresh_tokens)
+        )
+        pipeline.execute()
 
 
 def validate_session(*, for_socket: bool = False) -> None:
@@ -237,7 +361,7 @@ def validate_session(*, for_socket: bool = False) -> None:
     if refresh_token:
         try:
             if for_socket:
-                validate_refresh_token(refresh_token)
+                refresh_token = resolve_refresh_token(refresh_token)
                 set_current_session_data(refresh_token=refresh_token)
             else:
                 auth_token, refresh_token = refresh_session(refresh_token=refresh_token)
@@ -272,7 +396,86 @@ def validate_not_expired_session(session: Session, *, nested: bool = False) -> N
         raise SessionExpiredException()
 
 
+def get_refreshed_tokens(refresh_token: str) -> Optional[tuple[str, str]]:
+    refreshed_tokens: Optional[str] = redis.get(
+        f"session_refresh:{hash_token(refresh_token)}"
+    )  # type: ignore
+
+    if refreshed_tokens:
+        auth_token, new_refresh_token = json.loads(refreshed_tokens)
+
+        # The grace result outlives a signout or password change, so it only counts
+        # while the session it was rotated into still exists
+        with db.session.begin():
+            session_data = get_session_data_by_refresh_token(new_refresh_token)
+
+        if session_data is None:
+            return None
+
+        return auth_token, new_refresh_token
+
+
+def resolve_refresh_token(refresh_token: str) -> str:
+    # A token rotated within the grace window resolves to its replacement
+    refreshed_tokens = get_refreshed_tokens(refresh_token)
+    return refreshed_tokens[1] if refreshed_tokens else refresh_token
+
+
 def refresh_session(refresh_token: str) -> tuple[str, str]:
+    refreshed_tokens = get_refreshed_tokens(refresh_token)
+
+    if refreshed_tokens:
+        return refreshed_tokens
+
+    # Concurrent refreshes of the same token, from any worker, share a single rotation
+    lock = redis.lock(
+        f"session_refresh_lock:{hash_token(refresh_token)}",
+        timeout=REFRESH_LOCK_TIMEOUT_SECS,
+    )
+
+    try:
+        acquired = lock.acquire(blocking=False)
+    except RedisError:
+        # Without Redis the row lock of the rotation still keeps it to one winner
+        return _rotate_session(refresh_token)
+
+    if not acquired:
+        refreshed_tokens = _wait_for_refreshed_tokens(refresh_token, lock.name)
+
+        if refreshed_tokens:
+            return refreshed_tokens
+
+        return _rotate_session(refresh_token)
+
+    try:
+        return _rotate_session(refresh_token)
+    finally:
+        # Already expired, or Redis went away; either way the lock times out by itself
+        try:
+            lock.release()
+        except RedisError:
+            pass
+
+
+def _wait_for_refreshed_tokens(
+    refresh_token: str,
+    lock_name: str,
+) -> Optional[tuple[str, str]]:
+    deadline = time.monotonic() + REFRESH_LOCK_TIMEOUT_SECS
+
+    while time.monotonic() < deadline:
+        time.sleep(REFRESH_WAIT_INTERVAL_SECS)
+        refreshed_tokens = get_refreshed_tokens(refresh_token)
+
+        if refreshed_tokens:
+            return refreshed_tokens
+
+        # The lock holder gave up without rotating, e.g. the session was not found
+        if not redis.exists(lock_name):
+            return None
+
+
+def _rotate_session(refresh_token: str) -> tuple[str, str]:
     with db.session.begin():
         session = get_session_by_refresh_token_or_raise(refresh_token, for_update=True)
         validate_not_expired_session(session, nested=True)
@@ -284,8 +487,18 @@ def refresh_session(refresh_token: str) -> tuple[str, str]:
 
         user = user_service.get_user_by_id_or_raise(session.user_id)
         jwt = create_jwt(session.id, user.id, user.username, user.name)
+        new_refresh_token = session.refresh_token
+
+    delete_cached_session_data(refresh_token)
+
+    # Keep the previous token usable for a few seconds by handing out the same result
+    redis.set(
+        f"session_refresh:{hash_token(refresh_token)}",
+        json.dumps([jwt, new_refresh_token]),
+        ex=env.SESSION_REFRESH_GRACE_SECS,
+    )
 
-        return jwt, session.refresh_token
+    return jwt, new_refresh_token
 
 
 @overload
@@ -314,22 +527,42 @@ def delete_session(
 
     with begin_session():
         session = get_session_by_id_or_raise(session_id) if session_id else session
+        refresh_token = session.refresh_token  # type: ignore
         db.session.delete(session)
 
+    delete_cached_session_data(refresh_token)
+
 
 def delete_current_session() -> None:
     session_id = get_current_session_data().session_id
     delete_session(session_id=session_id)
 
 
-def clean_expired_sessions() -> None:
-    with db.session.begin():
-        expired_sessions = (
-            db.session.query(Session)
-            .filter(Session.expires_at < datetime.now(timezone.utc))
-            .with_for_update()
-            .all()
-        )
-
-        for expired_session in expired_sessions:
-            delete_session(session=expired_session, nested=True)
+def clean_expired_sessions() -> int:
+    batch_size = env.SESSION_CLEANUP_BATCH_SIZE
+    deadline = time.monotonic() + env.SESSION_CLEANUP_TIME_BUDGET_SECS
+    deleted_count = 0
+
+    # Batch by batch only while leading, so a node that lost the lease stops before
+    # the next one takes over
+    while time.monotonic() < deadline and scheduler_lease.is_held():
+        with db.session.begin():
+            # Rows locked by a concurrent refresh or signout are left for the next run
+            expired_session_ids = (
+                select(Session.id)
+                .where(Session.expires_at < db.func.now())
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = db.session.execute(
+                delete(Session)
+                .where(Session.id.in_(expired_session_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+        deleted_count += result.rowcount  # type: ignore
+
+        if result.rowcount < batch_size:  # type: ignore
+            break
+
+    return deleted_count
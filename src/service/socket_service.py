@@ -1,4 +1,5 @@
 from typing import Literal, Optional, overload
+from uuid import UUID
 
 from flask import request
 from flask_socketio import disconnect, emit, join_room
@@ -14,6 +15,13 @@ from src.common.exception.socket_session_not_found import SocketSessionNotFoundE
 from src.service import session_service
 from src.singleton.redis import redis
 
+CHAT_NAMESPACE = "/sockets/chats"
+SOCKET_SESSION_EXPIRATION_SECS = 60 * 60 * 24 * 30  # 30 days
+
+# Parsed session of every connection handled by this process, Redis stays the source
+# of truth for the other workers
+socket_sessions: dict[str, SessionData] = {}
+
 
 def get_sid() -> str:
     sid: str | None = request.sid  # type: ignore
@@ -32,18 +40,30 @@ def get_namespace() -> str:
 
 
 def set_socket_session() -> None:
-    session_data = session_service.get_current_session_data().flatten()
-    key = f"socket_session:{get_sid()}"
-    redis.hset(key, mapping=session_data)
-    redis.expire(key, 60 * 60 * 24 * 30)  # 30 days
+    sid = get_sid()
+    session_data = session_service.get_current_session_data()
+    socket_sessions[sid] = session_data
+
+    key = f"socket_session:{sid}"
+    pipeline = redis.pipeline()
+    pipeline.hset(key, mapping=session_data.flatten())
+    pipeline.expire(key, SOCKET_SESSION_EXPIRATION_SECS)
+    pipeline.execute()
 
 
 def get_socket_session() -> Optional[SessionData]:
-    socket_session: dict = redis.hgetall(f"socket_session:{get_sid()}")  # type: ignore
+    sid = get_sid()
+    session_data = socket_sessions.get(sid)
+
+    if session_data is not None:
+        return session_data
+
+    socket_session: dict = redis.hgetall(f"socket_session:{sid}")  # type: ignore
 
     if socket_session:
         try:
             session_data = SessionData.from_flattened(socket_session)
+            socket_sessions[sid] = session_data
             return session_data
         except Exception:
             pass
@@ -58,8 +78,19 @@ def get_socket_session_or_raise() -> SessionData:
 
 
 def delete_socket_session() -> None:
-    redis.delete(f"socket_session:{get_sid()}")
+    sid = get_sid()
+    socket_sessions.pop(sid, None)
+    redis.delete(f"socket_session:{sid}")
 
 
 def connect_to_room(room: str) -> None:
     join_room(room)
+
+
+def get_user_room(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def connect_to_user_room() -> None:
+    user_id = get_socket_session_or_raise().user_data.user_id
+    connect_to_room(get_user_room(user_id))
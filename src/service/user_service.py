@@ -13,6 +13,7 @@ from src.common.exception.http.username_already_in_use_exception import (
 from src.model.user import User
 from src.service import session_service
 from src.singleton.db import db
+from src.singleton.worker_pool import worker_pool
 
 
 def user_exists(username: str, *, for_update: bool = False) -> bool:
@@ -26,11 +27,21 @@ def user_exists(username: str, *, for_update: bool = False) -> bool:
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    # bcrypt is CPU bound, so run it off the hub to keep other greenlets responsive
+    hashed_password: bytes = worker_pool.execute(
+        bcrypt.hashpw,
+        password.encode("utf-8"),
+        bcrypt.gensalt(),
+    )
+    return hashed_password.decode("utf-8")
 
 
 def check_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return worker_pool.execute(
+        bcrypt.checkpw,
+        password.encode("utf-8"),
+        hashed_password.encode("utf-8"),
+    )
 
 
 def create_user(name: str, username: str, password: str) -> None:
@@ -102,6 +113,9 @@ def update_name(new_name: str) -> None:
         user = get_user_by_id_or_raise(user_id, for_update=True)
         user.name = new_name
         db.session.add(user)
+        refresh_tokens = [session.refresh_token for session in user.sessions]
+
+    session_service.delete_cached_session_data(*refresh_tokens)
 
 
 def update_username(new_username: str) -> None:
@@ -113,6 +127,9 @@ def update_username(new_username: str) -> None:
         user = get_user_by_id_or_raise(user_id, for_update=True)
         user.username = new_username
         db.session.add(user)
+        refresh_tokens = [session.refresh_token for session in user.sessions]
+
+    session_service.delete_cached_session_data(*refresh_tokens)
 
 
 def update_password(old_password: str, new_password: str) -> None:
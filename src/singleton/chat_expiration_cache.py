@@ -0,0 +1,8 @@
+from datetime import datetime
+
+from src.common.util.ttl_lru_cache import TtlLruCache
+from src.singleton.env import env
+
+chat_expiration_cache: TtlLruCache[datetime] = TtlLruCache(
+    "chat_expiration_cache", env.CHAT_EXPIRATION_CACHE_SIZE
+)
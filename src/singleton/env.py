@@ -1,5 +1,5 @@
 import os
-from typing import Literal
+from typing import Any, Literal, Optional
 
 from dotenv import load_dotenv
 
@@ -27,6 +27,88 @@ class Env:
         self._FLASK_ENV = flask_env
         self._MESSAGE_TTL_SECS = int(self._get_env_var("MESSAGE_TTL_SECS"))
         self._REDIS_URL = self._get_env_var("REDIS_URL")
+        self._DB_GREEN_MODE = self._get_bool_env_var("DB_GREEN_MODE", default=True)
+        self._DB_POOL_SIZE = int(self._get_env_var("DB_POOL_SIZE", default="20"))
+        self._DB_MAX_OVERFLOW = int(self._get_env_var("DB_MAX_OVERFLOW", default="20"))
+        self._WORKER_POOL_SIZE = int(self._get_env_var("WORKER_POOL_SIZE", default="4"))
+        self._JWT_CACHE_SIZE = int(self._get_env_var("JWT_CACHE_SIZE", default="10000"))
+        self._SESSION_CLEANUP_BATCH_SIZE = int(
+            self._get_env_var("SESSION_CLEANUP_BATCH_SIZE", default="1000")
+        )
+        self._SESSION_CLEANUP_TIME_BUDGET_SECS = int(
+            self._get_env_var("SESSION_CLEANUP_TIME_BUDGET_SECS", default="30")
+        )
+        self._SESSION_REFRESH_GRACE_SECS = int(
+            self._get_env_var("SESSION_REFRESH_GRACE_SECS", default="10")
+        )
+        self._MESSAGE_INGESTION_MODE = self._get_choice_env_var(
+            "MESSAGE_INGESTION_MODE", ("direct", "stream"), default="direct"
+        )
+        self._MESSAGE_BATCH_SIZE = int(
+            self._get_env_var("MESSAGE_BATCH_SIZE", default="500")
+        )
+        self._MESSAGE_BATCH_WINDOW_MILLIS = int(
+            self._get_env_var("MESSAGE_BATCH_WINDOW_MILLIS", default="200")
+        )
+        self._SCHEDULER_MODE = self._get_choice_env_var(
+            "SCHEDULER_MODE", ("embedded", "standalone", "disabled"), default="embedded"
+        )
+        self._SCHEDULER_LEASE_SECS = int(
+            self._get_env_var("SCHEDULER_LEASE_SECS", default="15")
+        )
+        self._SERVER_WORKERS = int(self._get_env_var("SERVER_WORKERS", default="1"))
+        self._SERVER_WORKER_CONNECTIONS = int(
+            self._get_env_var("SERVER_WORKER_CONNECTIONS", default="1000")
+        )
+        self._SERVER_TIMEOUT_SECS = int(
+            self._get_env_var("SERVER_TIMEOUT_SECS", default="30")
+        )
+        self._SERVER_GRACEFUL_TIMEOUT_SECS = int(
+            self._get_env_var("SERVER_GRACEFUL_TIMEOUT_SECS", default="30")
+        )
+        self._SERVER_KEEPALIVE_SECS = int(
+            self._get_env_var("SERVER_KEEPALIVE_SECS", default="5")
+        )
+        self._SERVER_MAX_REQUESTS = int(
+            self._get_env_var("SERVER_MAX_REQUESTS", default="0")
+        )
+        self._SERVER_MAX_REQUESTS_JITTER = int(
+            self._get_env_var("SERVER_MAX_REQUESTS_JITTER", default="0")
+        )
+        self._DB_POOL_TIMEOUT_SECS = int(
+            self._get_env_var("DB_POOL_TIMEOUT_SECS", default="5")
+        )
+        self._DB_POOL_RECYCLE_SECS = int(
+            self._get_env_var("DB_POOL_RECYCLE_SECS", default="1800")
+        )
+        self._DB_POOL_PRE_PING = self._get_bool_env_var(
+            "DB_POOL_PRE_PING", default=True
+        )
+        self._REDIS_POOL_SIZE = int(self._get_env_var("REDIS_POOL_SIZE", default="50"))
+        self._REDIS_POOL_TIMEOUT_SECS = int(
+            self._get_env_var("REDIS_POOL_TIMEOUT_SECS", default="5")
+        )
+        self._DB_REPLICA_URLS = [
+            url.strip()
+            for url in self._get_env_var("DB_REPLICA_URLS", default="").split(",")
+            if url.strip()
+        ]
+        self._DB_REPLICA_STICKINESS_SECS = int(
+            self._get_env_var("DB_REPLICA_STICKINESS_SECS", default="5")
+        )
+        self._SESSION_CACHE_TTL_SECS = int(
+            self._get_env_var("SESSION_CACHE_TTL_SECS", default="300")
+        )
+        self._SERVER_PROXY_HOPS = int(
+            self._get_env_var("SERVER_PROXY_HOPS", default="0")
+        )
+        self._SOCKETIO_WEBSOCKET_ONLY = self._get_bool_env_var(
+            "SOCKETIO_WEBSOCKET_ONLY", default=False
+        )
+        self._METRICS_TOKEN = self._get_env_var("METRICS_TOKEN", default="")
+        self._CHAT_EXPIRATION_CACHE_SIZE = int(
+            self._get_env_var("CHAT_EXPIRATION_CACHE_SIZE", default="10000")
+        )
 
     @property
     def DB_URL(self) -> str:
@@ -60,14 +142,159 @@ class Env:
     def REDIS_URL(self) -> str:
         return self._REDIS_URL
 
+    @property
+    def DB_GREEN_MODE(self) -> bool:
+        return self._DB_GREEN_MODE
+
+    @property
+    def DB_POOL_SIZE(self) -> int:
+        return self._DB_POOL_SIZE
+
+    @property
+    def DB_MAX_OVERFLOW(self) -> int:
+        return self._DB_MAX_OVERFLOW
+
+    @property
+    def WORKER_POOL_SIZE(self) -> int:
+        return self._WORKER_POOL_SIZE
+
+    @property
+    def JWT_CACHE_SIZE(self) -> int:
+        return self._JWT_CACHE_SIZE
+
+    @property
+    def SESSION_CLEANUP_BATCH_SIZE(self) -> int:
+        return self._SESSION_CLEANUP_BATCH_SIZE
+
+    @property
+    def SESSION_CLEANUP_TIME_BUDGET_SECS(self) -> int:
+        return self._SESSION_CLEANUP_TIME_BUDGET_SECS
+
+    @property
+    def SESSION_REFRESH_GRACE_SECS(self) -> int:
+        return self._SESSION_REFRESH_GRACE_SECS
+
+    @property
+    def MESSAGE_INGESTION_MODE(self) -> Literal["direct", "stream"]:
+        return self._MESSAGE_INGESTION_MODE
+
+    @property
+    def MESSAGE_BATCH_SIZE(self) -> int:
+        return self._MESSAGE_BATCH_SIZE
+
+    @property
+    def MESSAGE_BATCH_WINDOW_MILLIS(self) -> int:
+        return self._MESSAGE_BATCH_WINDOW_MILLIS
+
+    @property
+    def SCHEDULER_MODE(self) -> Literal["embedded", "standalone", "disabled"]:
+        return self._SCHEDULER_MODE
+
+    @property
+    def SCHEDULER_LEASE_SECS(self) -> int:
+        return self._SCHEDULER_LEASE_SECS
+
+    @property
+    def SERVER_WORKERS(self) -> int:
+        return self._SERVER_WORKERS
+
+    @property
+    def SERVER_WORKER_CONNECTIONS(self) -> int:
+        return self._SERVER_WORKER_CONNECTIONS
+
+    @property
+    def SERVER_TIMEOUT_SECS(self) -> int:
+        return self._SERVER_TIMEOUT_SECS
+
+    @property
+    def SERVER_GRACEFUL_TIMEOUT_SECS(self) -> int:
+        return self._SERVER_GRACEFUL_TIMEOUT_SECS
+
+    @property
+    def SERVER_KEEPALIVE_SECS(self) -> int:
+        return self._SERVER_KEEPALIVE_SECS
+
+    @property
+    def SERVER_MAX_REQUESTS(self) -> int:
+        return self._SERVER_MAX_REQUESTS
+
+    @property
+    def SERVER_MAX_REQUESTS_JITTER(self) -> int:
+        return self._SERVER_MAX_REQUESTS_JITTER
+
+    @property
+    def DB_POOL_TIMEOUT_SECS(self) -> int:
+        return self._DB_POOL_TIMEOUT_SECS
+
+    @property
+    def DB_POOL_RECYCLE_SECS(self) -> int:
+        return self._DB_POOL_RECYCLE_SECS
+
+    @property
+    def DB_POOL_PRE_PING(self) -> bool:
+        return self._DB_POOL_PRE_PING
+
+    @property
+    def REDIS_POOL_SIZE(self) -> int:
+        return self._REDIS_POOL_SIZE
+
+    @property
+    def REDIS_POOL_TIMEOUT_SECS(self) -> int:
+        return self._REDIS_POOL_TIMEOUT_SECS
+
+    @property
+    def DB_REPLICA_URLS(self) -> list[str]:
+        return self._DB_REPLICA_URLS
+
+    @property
+    def DB_REPLICA_STICKINESS_SECS(self) -> int:
+        return self._DB_REPLICA_STICKINESS_SECS
+
+    @property
+    def SESSION_CACHE_TTL_SECS(self) -> int:
+        return self._SESSION_CACHE_TTL_SECS
+
+    @property
+    def SERVER_PROXY_HOPS(self) -> int:
+        return self._SERVER_PROXY_HOPS
+
+    @property
+    def SOCKETIO_WEBSOCKET_ONLY(self) -> bool:
+        return self._SOCKETIO_WEBSOCKET_ONLY
+
+    @property
+    def METRICS_TOKEN(self) -> str:
+        return self._METRICS_TOKEN
+
+    @property
+    def CHAT_EXPIRATION_CACHE_SIZE(self) -> int:
+        return self._CHAT_EXPIRATION_CACHE_SIZE
+
     @staticmethod
-    def _get_env_var(key: str) -> str:
+    def _get_env_var(key: str, *, default: Optional[str] = None) -> str:
         value = os.getenv(key)
 
         if not value:
+            if default is not None:
+                return default
+
+            raise EnvNotDefinedException(key)
+
+        return value
+
+    @staticmethod
+    def _get_choice_env_var(key: str, choices: tuple[str, ...], *, default: str) -> Any:
+        value = Env._get_env_var(key, default=default)
+
+        if value not in choices:
             raise EnvNotDefinedException(key)
 
         return value
 
+    @staticmethod
+    def _get_bool_env_var(key: str, *, default: bool) -> bool:
+        value = Env._get_env_var(key, default=str(default).lower())
+        return value.lower() in ("1", "true", "yes")
+
 
 env = Env()
@@ -0,0 +1,5 @@
+from src.common.dto.jwt_payload import JwtPayload
+from src.common.util.ttl_lru_cache import TtlLruCache
+from src.singleton.env import env
+
+jwt_cache: TtlLruCache[JwtPayload] = TtlLruCache("jwt_cache", env.JWT_CACHE_SIZE)
@@ -0,0 +1,60 @@
+from bisect import bisect_left
+from threading import Lock
+
+# Upper bounds, in seconds, of the histogram buckets
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, list[float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            # One count per bucket plus an overflow one, then the count and the sum
+            histogram = self._histograms.setdefault(
+                name, [0.0] * (len(HISTOGRAM_BUCKETS) + 3)
+            )
+            histogram[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+            histogram[-2] += 1
+            histogram[-1] += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": self._counters.copy(),
+                "gauges": self._gauges.copy(),
+                "histograms": {
+                    name: self._format_histogram(histogram)
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    @staticmethod
+    def _format_histogram(histogram: list[float]) -> dict:
+        buckets: dict[str, int] = {}
+        cumulative_count = 0
+
+        for upper_bound, count in zip((*HISTOGRAM_BUCKETS, "+Inf"), histogram):
+            cumulative_count += int(count)
+            buckets[str(upper_bound)] = cumulative_count
+
+        return {
+            "buckets": buckets,
+            "count": int(histogram[-2]),
+            "sum": histogram[-1],
+        }
+
+
+metrics = Metrics()
@@ -1,5 +1,20 @@
+import os
+
 from redis import Redis
 
+from src.common.util.timed_blocking_connection_pool import TimedBlockingConnectionPool
 from src.singleton.env import env
 
-redis = Redis.from_url(env.REDIS_URL, decode_responses=True)
+# Bounded pool, callers wait up to the timeout for a free connection instead of
+# opening new ones without limit
+redis = Redis(
+    connection_pool=TimedBlockingConnectionPool.from_url(
+        env.REDIS_URL,
+        decode_responses=True,
+        max_connections=env.REDIS_POOL_SIZE,
+        timeout=env.REDIS_POOL_TIMEOUT_SECS,
+    )
+)
+
+# Forked processes start with an empty pool instead of the parent's connections
+os.register_at_fork(after_in_child=redis.connection_pool.reset)
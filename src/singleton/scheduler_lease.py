@@ -0,0 +1,5 @@
+from src.common.util.redis_lease import RedisLease
+from src.singleton.env import env
+from src.singleton.redis import redis
+
+scheduler_lease = RedisLease(redis, "scheduler_leader", env.SCHEDULER_LEASE_SECS)
@@ -0,0 +1,39 @@
+from typing import Any, Callable
+
+from eventlet import tpool
+
+from src.singleton.env import env
+from src.singleton.metrics import metrics
+
+
+class WorkerPool:
+    def __init__(self, size: int) -> None:
+        # Must be set before the first tpool.execute call, which spawns the threads
+        tpool.set_num_threads(size)
+        self._size = size
+        self._in_flight = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._in_flight - self._size, 0)
+
+    def execute(self, function: Callable, *args, **kwargs) -> Any:
+        self._set_in_flight(self._in_flight + 1)
+
+        try:
+            # Runs on a native thread while the calling greenlet yields to the hub
+            return tpool.execute(function, *args, **kwargs)
+        finally:
+            self._set_in_flight(self._in_flight - 1)
+
+    def _set_in_flight(self, in_flight: int) -> None:
+        self._in_flight = in_flight
+        metrics.set_gauge("worker_pool_in_flight", self._in_flight)
+        metrics.set_gauge("worker_pool_queue_depth", self.queue_depth)
+
+
+worker_pool = WorkerPool(env.WORKER_POOL_SIZE)
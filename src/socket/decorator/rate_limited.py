@@ -0,0 +1,42 @@
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import request
+
+from src.common.dto.rate_limit import RateLimit
+from src.service import rate_limit_service, socket_service
+from src.socket.error_handler import error_handler
+
+
+def rate_limited(
+    event: str,
+    *,
+    per_user: Optional[RateLimit] = None,
+    per_ip: Optional[RateLimit] = None,
+) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                limits: dict[str, RateLimit] = {}
+
+                if per_ip:
+                    ip = request.remote_addr
+                    limits[rate_limit_service.get_ip_key(event, ip)] = per_ip
+                if per_user:
+                    # Must be applied below handle_auth_namespace_connection
+                    socket_session = socket_service.get_socket_session_or_raise()
+                    user_id = socket_session.user_data.user_id
+                    limits[rate_limit_service.get_user_key(event, user_id)] = per_user
+
+                rate_limit_service.take_token(limits)
+            except Exception as e:
+                error_handler(e)
+                # Refuses the connection when limiting a connect handler
+                return False
+
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
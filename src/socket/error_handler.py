@@ -2,6 +2,9 @@ from flask_socketio import disconnect, emit
 from marshmallow import ValidationError
 
 from src.common.exception.http.http_exception import HttpException
+from src.common.exception.http.too_many_requests_exception import (
+    TooManyRequestsException,
+)
 from src.common.exception.socket_session_not_found import SocketSessionNotFoundException
 from src.service import socket_service
 from src.socket.response_body import ResponseBody
@@ -9,6 +12,12 @@ from src.socket.response_body import ResponseBody
 
 def error_handler(e):
 
+    if isinstance(e, TooManyRequestsException):
+        emit(
+            "error_response",
+            ResponseBody(e.message, {"retry_after": e.retry_after}).to_dict(),
+        )
+        return
     if isinstance(e, HttpException):
         emit("error_response", ResponseBody(e.message).to_dict())
         return
@@ -1,12 +1,14 @@
-from flask_socketio import Namespace, emit
+from flask_socketio import Namespace
 
-from src.service import chat_service
+from src.common.dto.rate_limit import RateLimit
+from src.service import chat_service, socket_service
 from src.socket.decorator.handle_auth_namespace_connection import (
     handle_auth_namespace_connection,
 )
 from src.socket.decorator.handle_auth_namespace_disconnection import (
     handle_auth_namespace_disconnection,
 )
+from src.socket.decorator.rate_limited import rate_limited
 from src.socket.dto.chat.new_message_dto import NewMessageDto
 from src.socket.error_handler import error_handler
 from src.socket.response_body import ResponseBody
@@ -14,23 +16,29 @@ from src.socket.schema.chat.send_message_schema import SendMessageSchema
 
 
 class ChatNamespace(Namespace):
+    @rate_limited("connect", per_ip=RateLimit.per_minute(30))
     @handle_auth_namespace_connection
     def on_connect(self):
-        chat_service.connect_to_all_chats()
+        socket_service.connect_to_user_room()
 
+    @rate_limited(
+        "send_message",
+        per_user=RateLimit.per_second(5, burst=20),
+        per_ip=RateLimit.per_second(20, burst=50),
+    )
     def on_send_message(self, data):
         try:
             data = SendMessageSchema().load(data)
             message = chat_service.send_message(data["chat_id"], data["content"])  # type: ignore
             response_data = NewMessageDto.from_message(message)
 
-            emit(
+            chat_service.emit_to_chat(
                 "new_message",
                 ResponseBody(
                     message="New message coming.",
                     data=response_data.__dict__,
-                ).to_dict(),
-                to=str(message.chat_id),
+                ),
+                message.chat_id,
             )
         except Exception as e:
             error_handler(e)
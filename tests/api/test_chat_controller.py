@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+
+from src.model.chat import Chat
+from src.model.chat_participant import ChatParticipant
+from src.model.message import Message
+from src.model.user import User
+from src.service import session_service
+from src.singleton.db import db
+
+
+def create_user(username: str) -> User:
+    user = User(name=username.title(), username=username, password_hash="hash")  # type: ignore
+    db.session.add(user)
+    return user
+
+
+def create_chats(user: User, count: int) -> None:
+    for index in range(count):
+        contact = create_user(f"contact{index}")
+        participant = ChatParticipant(user=user)  # type: ignore
+        chat = Chat(
+            participants=[participant, ChatParticipant(user=contact)],  # type: ignore
+        )
+        chat.messages = [  # type: ignore
+            Message(sender=participant, content=f"Message {message_index}")  # type: ignore
+            for message_index in range(3)
+        ]
+        db.session.add(chat)
+
+    db.session.commit()
+
+
+def get_auth_headers(user: User) -> dict:
+    auth_token = session_service.create_jwt(
+        user.id, user.id, user.username, user.name  # Not checked against a session
+    )
+    return {"Authorization": f"Bearer {auth_token}|refresh-token"}
+
+
+@pytest.fixture
+def query_counter(database):
+    queries = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count_query)
+    yield queries
+    event.remove(db.engine, "before_cursor_execute", count_query)
+
+
+@pytest.mark.parametrize("chat_count", [1, 5, 25])
+def test_get_all_chats_runs_constant_queries(client, query_counter, chat_count):
+    user = create_user("user")
+    create_chats(user, chat_count)
+    headers = get_auth_headers(user)
+    query_counter.clear()
+
+    response = client.get("/chats", headers=headers)
+
+    assert response.status_code == 200
+    chats = response.get_json()["data"]
+    assert len(chats) == chat_count
+    assert all(len(chat["participants"]) == 2 for chat in chats)
+    assert all(len(chat["messages"]) == 3 for chat in chats)
+    # Chats, participants, users and recent messages, however many chats there are
+    assert len(query_counter) == 4
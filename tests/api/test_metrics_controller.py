@@ -0,0 +1,25 @@
+import pytest
+
+from src.singleton.env import env
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(env, "_METRICS_TOKEN", "metrics-token")
+    return "metrics-token"
+
+
+def test_metrics_is_disabled_without_token(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_rejects_wrong_token(client, metrics_token):
+    response = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+
+def test_metrics_accepts_token(client, metrics_token):
+    response = client.get(
+        "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}
+    )
+    assert response.status_code == 200
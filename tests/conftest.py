@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import text
+
+# The environment is read once, when the singletons are first imported
+os.environ.update(
+    FLASK_ENV="development",
+    # Tests that query use the Postgres schema, the rest only need a valid URL
+    DB_URL=os.environ.get("TEST_DB_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db",
+    DB_REPLICA_URLS="",
+    DB_GREEN_MODE="false",
+    REDIS_URL=os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/15"),
+    SECRET_KEY="test-secret-key",
+    SESSION_EXPIRATION_SECS="3600",
+    JWT_SECRET_KEY="test-jwt-secret-key",
+    JWT_EXPIRATION_SECS="300",
+    MESSAGE_TTL_SECS="600",
+)
+
+from flask_migrate import upgrade  # noqa: E402
+
+from src.factory import build_app  # noqa: E402
+from src.singleton.db import db  # noqa: E402
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+@pytest.fixture
+def app():
+    app = build_app()
+
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def database(app):
+    if not os.environ.get("TEST_DB_URL"):
+        pytest.skip("Needs a disposable Postgres database at TEST_DB_URL")
+
+    upgrade(directory=MIGRATIONS_DIRECTORY)
+    yield db
+    db.session.remove()
+
+    with db.session.begin():
+        db.session.execute(
+            text("TRUNCATE users, sessions, chats, chat_participants, messages")
+        )
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,48 @@
+import uuid
+
+import requests
+import socketio
+
+from src.service.socket_service import CHAT_NAMESPACE
+
+CONNECT_TIMEOUT_SECS = 10
+PASSWORD = "Password1!"
+
+
+def get_unique_username(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
+def signup_and_signin(url: str, username: str) -> str:
+    response = requests.post(
+        f"{url}/auth/signup",
+        json={"name": username, "username": username, "password": PASSWORD},
+    )
+    assert response.status_code == 201
+
+    response = requests.post(
+        f"{url}/auth/signin", json={"username": username, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+    return response.headers["Authorization"]
+
+
+def create_direct_chat(url: str, authorization: str, contact_username: str) -> str:
+    response = requests.post(
+        f"{url}/chats/direct",
+        json={"contact_username": contact_username},
+        headers={"Authorization": authorization},
+    )
+    assert response.status_code == 201
+    return response.json()["data"]["id"]
+
+
+def connect(url: str, authorization: str) -> socketio.Client:
+    client = socketio.Client()
+    client.connect(
+        url,
+        headers={"Authorization": authorization},
+        namespaces=[CHAT_NAMESPACE],
+        wait_timeout=CONNECT_TIMEOUT_SECS,
+    )
+    return client
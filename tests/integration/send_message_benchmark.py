@@ -0,0 +1,82 @@
+import eventlet
+
+eventlet.monkey_patch()
+
+import json  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import uuid  # noqa: E402
+from typing import List  # noqa: E402
+
+from flask import Flask, request  # noqa: E402
+
+from src.common.dto.session_data import SessionData  # noqa: E402
+from src.common.dto.user_data import UserData  # noqa: E402
+from src.factory import build_app  # noqa: E402
+from src.model.chat import Chat  # noqa: E402
+from src.model.chat_participant import ChatParticipant  # noqa: E402
+from src.model.user import User  # noqa: E402
+from src.service import chat_service, socket_service  # noqa: E402
+from src.singleton.db import db  # noqa: E402
+
+# Measures messages/sec of send_message into one hot chat, with a greenlet per sender
+# like concurrent sockets on one worker. Run with the server's environment:
+#   python -m tests.integration.send_message_benchmark <senders> <messages per sender>
+
+
+def create_hot_chat(sender_count: int) -> tuple[uuid.UUID, List[UserData]]:
+    suffix = uuid.uuid4().hex[:8]
+    senders = [
+        User(name="Sender", username=f"sender_{suffix}_{index}", password_hash="hash")  # type: ignore
+        for index in range(sender_count)
+    ]
+    chat = Chat(participants=[ChatParticipant(user=sender) for sender in senders])  # type: ignore
+
+    db.session.add(chat)
+    db.session.commit()
+    return chat.id, [
+        UserData(user_id=sender.id, username=sender.username, name=sender.name)
+        for sender in senders
+    ]
+
+
+def send_messages(app: Flask, chat_id: uuid.UUID, sender: UserData, count: int) -> None:
+    with app.test_request_context():
+        # Stands in for the session the connect handler sets up
+        request.sid = f"benchmark:{sender.user_id}"  # type: ignore
+        socket_service.socket_sessions[request.sid] = SessionData(  # type: ignore
+            session_id=uuid.uuid4(), user_data=sender
+        )
+
+        for index in range(count):
+            chat_service.send_message(chat_id, f"Message {index}")
+
+
+def run(sender_count: int, messages_per_sender: int) -> float:
+    app = build_app()
+
+    with app.app_context():
+        chat_id, senders = create_hot_chat(sender_count)
+
+    pool = eventlet.GreenPool(sender_count)
+    started_at = time.perf_counter()
+
+    for sender in senders:
+        pool.spawn(send_messages, app, chat_id, sender, messages_per_sender)
+
+    pool.waitall()
+    elapsed = time.perf_counter() - started_at
+
+    with app.app_context():
+        db.session.delete(db.session.get(Chat, chat_id))
+        db.session.query(User).filter(
+            User.id.in_([sender.user_id for sender in senders])
+        ).delete()
+        db.session.commit()
+
+    return sender_count * messages_per_sender / elapsed
+
+
+if __name__ == "__main__":
+    messages_per_sec = run(int(sys.argv[1]), int(sys.argv[2]))
+    print(json.dumps({"messages_per_sec": messages_per_sec}))
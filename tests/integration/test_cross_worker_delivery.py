@@ -0,0 +1,48 @@
+import queue
+
+import pytest
+
+from src.service.socket_service import CHAT_NAMESPACE
+
+# The Socket.IO client and its transports, from python-socketio[client]
+pytest.importorskip("requests")
+pytest.importorskip("websocket")
+
+from tests.integration.client import (  # noqa: E402
+    connect,
+    create_direct_chat,
+    get_unique_username,
+    signup_and_signin,
+)
+
+DELIVERY_TIMEOUT_SECS = 10
+
+
+def test_room_emit_reaches_client_on_other_server(start_servers):
+    sender_url, receiver_url = start_servers(2)
+    sender_username = get_unique_username("sender")
+    receiver_username = get_unique_username("receiver")
+    sender_authorization = signup_and_signin(sender_url, sender_username)
+    receiver_authorization = signup_and_signin(receiver_url, receiver_username)
+    chat_id = create_direct_chat(sender_url, sender_authorization, receiver_username)
+    received_messages: queue.Queue = queue.Queue()
+
+    receiver = connect(receiver_url, receiver_authorization)
+    receiver.on(
+        "new_message", received_messages.put, namespace=CHAT_NAMESPACE
+    )  # type: ignore
+    sender = connect(sender_url, sender_authorization)
+
+    try:
+        # Emitted to the participants' rooms by the sender's server only
+        sender.emit(
+            "send_message",
+            {"chat_id": chat_id, "content": "Hello from the other server"},
+            namespace=CHAT_NAMESPACE,
+        )
+        body = received_messages.get(timeout=DELIVERY_TIMEOUT_SECS)
+    finally:
+        sender.disconnect()
+        receiver.disconnect()
+
+    assert body["data"]["content"] == "Hello from the other server"
@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.integration.conftest import get_server_env
+
+SENDER_COUNTS = [1, 20]
+CONCURRENT_SENDER_COUNT = 20
+MESSAGES_PER_SENDER = 50
+
+# Throughput numbers depend on the machine, so these only run on request:
+#   RUN_BENCHMARKS=1 python -m pytest -s tests/integration/test_send_message_throughput.py
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS to run"
+)
+
+
+def measure_send_throughput(sender_count: int, **env: str) -> float:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tests.integration.send_message_benchmark",
+            str(sender_count),
+            str(MESSAGES_PER_SENDER),
+        ],
+        env=get_server_env(**env),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])["messages_per_sec"]
+
+
+@pytest.mark.parametrize("sender_count", SENDER_COUNTS)
+def test_hot_chat_send_throughput(migrated_db, sender_count):
+    messages_per_sec = measure_send_throughput(sender_count)
+    print(f"\n{sender_count} senders: {messages_per_sec:.0f} messages/sec")
+
+    assert messages_per_sec > 0
+
+
+def test_green_db_mode_keeps_concurrent_send_throughput(migrated_db):
+    # Without the psycopg wait callback a query blocks the whole worker, so concurrent
+    # senders queue behind each other instead of overlapping their round trips
+    blocking = measure_send_throughput(CONCURRENT_SENDER_COUNT, DB_GREEN_MODE="false")
+    green = measure_send_throughput(CONCURRENT_SENDER_COUNT, DB_GREEN_MODE="true")
+    print(f"\nblocking: {blocking:.0f} messages/sec, green: {green:.0f} messages/sec")
+
+    # Loose, since the gain shrinks to noise when the database is on loopback
+    assert green > blocking * 0.8
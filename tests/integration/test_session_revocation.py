@@ -0,0 +1,32 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from tests.integration.client import (  # noqa: E402
+    get_unique_username,
+    signup_and_signin,
+)
+
+
+def get_me(url: str, authorization: str) -> requests.Response:
+    return requests.get(f"{url}/users/me", headers={"Authorization": authorization})
+
+
+def test_signout_revokes_refresh_token_in_grace_window(start_servers):
+    (url,) = start_servers(1)
+    authorization = signup_and_signin(url, get_unique_username("user"))
+    old_refresh_token = authorization.split("|", 1)[1]
+
+    # An invalid auth token makes the request rotate the refresh token, which leaves
+    # the old one usable for the grace window
+    response = get_me(url, f"Bearer invalid|{old_refresh_token}")
+    assert response.status_code == 200
+    new_authorization = response.headers["Authorization"]
+    assert get_me(url, f"Bearer invalid|{old_refresh_token}").status_code == 200
+
+    response = requests.post(
+        f"{url}/auth/signout", headers={"Authorization": new_authorization}
+    )
+    assert response.status_code == 200
+
+    assert get_me(url, f"Bearer invalid|{old_refresh_token}").status_code == 401
@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.model.chat import Chat
+from src.model.chat_participant import ChatParticipant
+from src.model.message import Message
+from src.model.user import User
+from src.service import chat_service
+from src.singleton.db import db
+from src.singleton.redis import redis
+
+
+@pytest.fixture
+def message_stream(database):
+    try:
+        redis.ping()
+    except ConnectionError:
+        pytest.skip("Needs a Redis server at TEST_REDIS_URL")
+
+    yield
+    redis.delete(chat_service.MESSAGE_STREAM, chat_service.MESSAGE_DEAD_LETTER_STREAM)
+
+
+def add_stream_entry(chat_id: uuid.UUID, sender_user_id: uuid.UUID) -> tuple[str, dict]:
+    timestamp = datetime.now(timezone.utc)
+    fields = {
+        "id": str(uuid.uuid4()),
+        "chat_id": str(chat_id),
+        "sender_user_id": str(sender_user_id),
+        "content": "Hello",
+        "timestamp": timestamp.isoformat(),
+        "expires_at": (timestamp + timedelta(minutes=10)).isoformat(),
+    }
+    return redis.xadd(chat_service.MESSAGE_STREAM, fields), fields  # type: ignore
+
+
+def test_unpersistable_stream_entries_are_dead_lettered(message_stream):
+    chat_id, user_id = uuid.uuid4(), uuid.uuid4()
+    user = User(id=user_id, name="Sender", username="sender", password_hash="hash")  # type: ignore
+    db.session.add(Chat(id=chat_id, participants=[ChatParticipant(user=user)]))  # type: ignore
+    db.session.commit()
+
+    # The second chat was deleted before its message was persisted
+    persisted_entry = add_stream_entry(chat_id, user_id)
+    rejected_entry = add_stream_entry(uuid.uuid4(), user_id)
+
+    chat_service._persist_stream_entries([persisted_entry, rejected_entry])
+
+    assert [
+        message.id for message in db.session.query(Message).filter_by(chat_id=chat_id)
+    ] == [uuid.UUID(persisted_entry[1]["id"])]
+    assert redis.xlen(chat_service.MESSAGE_STREAM) == 0
+    dead_letters = redis.xrange(chat_service.MESSAGE_DEAD_LETTER_STREAM)
+    assert [fields["id"] for _, fields in dead_letters] == [rejected_entry[1]["id"]]